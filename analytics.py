@@ -5,17 +5,39 @@ This module implements the analytics functionality for collecting and analyzing
 performance metrics across different social media platforms.
 """
 
+from __future__ import annotations
+
+import bisect
 import datetime
 import logging
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 import json
 import os
-import pandas as pd
-import numpy as np
-from collections import defaultdict
+
+# numpy and pandas are imported where they are used, so that importing this
+# module stays cheap for callers that never run the analysis
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 logger = logging.getLogger("team_leader.analytics")
 
+# Columns of the Parquet metrics file that do not hold a numeric metric
+_RESERVED_COLUMNS = ("platform", "date", "extra")
+
+def _date_keys(index: pd.DatetimeIndex) -> List[str]:
+    """
+    Format a DatetimeIndex back into the YYYY-MM-DD keys used by metrics_store.
+    
+    Args:
+        index: Index of a metrics frame
+        
+    Returns:
+        List of date strings
+    """
+    import numpy as np
+    return np.datetime_as_string(index.to_numpy(dtype="datetime64[D]"), unit="D").tolist()
+
 class AnalyticsEngine:
     """
     Analytics engine for collecting and analyzing social media performance metrics.
@@ -36,7 +58,22 @@ class AnalyticsEngine:
         """
         self.config = config or {}
         self.metrics_store = {}
+        # Sorted date keys of metrics_store per platform
+        self._sorted_dates = {}
+        # Date-indexed numeric view of metrics_store, rebuilt lazily per platform
+        self._frames = {}
+        self._hourly = {}
+        # Running engagement/impressions totals over the frame rows, for O(1) window sums
+        self._prefix = {}
         self.platform_benchmarks = self._load_benchmarks()
+        # (platform, metric) -> benchmark, for single-lookup comparisons
+        self._flat_bench = {
+            (p, m): v
+            for p, metrics in self.platform_benchmarks.items()
+            for m, v in metrics.items()
+        }
+        # Platforms x metrics view of platform_benchmarks, built on first use
+        self._bench_df = None
         
         logger.info("AnalyticsEngine initialized")
     
@@ -88,10 +125,125 @@ class AnalyticsEngine:
         """
         if platform not in self.metrics_store:
             self.metrics_store[platform] = {}
+            self._sorted_dates[platform] = []
+        
+        if date not in self.metrics_store[platform]:
+            bisect.insort(self._sorted_dates[platform], date)
         
         self.metrics_store[platform][date] = metrics
+        self._frames.pop(platform, None)
+        self._hourly.pop(platform, None)
+        self._prefix.pop(platform, None)
         logger.info(f"Stored metrics for {platform} on {date}")
     
+    def _get_dates(self, platform: str, start_date: str, end_date: str) -> List[str]:
+        """
+        Get the stored dates for a platform within a date range.
+        
+        Args:
+            platform: Platform name
+            start_date: Start date string (YYYY-MM-DD), inclusive
+            end_date: End date string (YYYY-MM-DD), inclusive
+            
+        Returns:
+            List of date strings in ascending order
+        """
+        dates = self._sorted_dates[platform]
+        lo = bisect.bisect_left(dates, start_date)
+        hi = bisect.bisect_right(dates, end_date)
+        return dates[lo:hi]
+    
+    def _get_frame(self, platform: str) -> pd.DataFrame:
+        """
+        Get the numeric metrics for a platform as a date-indexed DataFrame.
+        
+        Args:
+            platform: Platform name
+            
+        Returns:
+            DataFrame with one row per stored date and one column per numeric metric
+        """
+        import pandas as pd
+        frame = self._frames.get(platform)
+        if frame is None:
+            frame = pd.DataFrame.from_dict(self.metrics_store[platform], orient="index")
+            frame.index = pd.to_datetime(frame.index, format="%Y-%m-%d", errors="coerce")
+            frame = frame[frame.index.notna()].sort_index().select_dtypes(include="number")
+            self._frames[platform] = frame
+        return frame
+    
+    def _get_hourly(self, platform: str) -> np.ndarray:
+        """
+        Get a platform's hourly engagement as a dense matrix aligned with its metrics frame.
+        
+        Args:
+            platform: Platform name
+            
+        Returns:
+            Array of shape (days, 24), NaN where no engagement was recorded
+        """
+        import numpy as np
+        hourly = self._hourly.get(platform)
+        if hourly is None:
+            frame = self._get_frame(platform)
+            store = self.metrics_store[platform]
+            hourly = np.full((len(frame), 24), np.nan)
+            for row, date_str in enumerate(_date_keys(frame.index)):
+                for hour, engagement in store[date_str].get("hourly_engagement", {}).items():
+                    hour_int = int(hour)
+                    if 0 <= hour_int < 24:
+                        hourly[row, hour_int] = engagement
+            self._hourly[platform] = hourly
+        return hourly
+    
+    def _get_prefix(self, platform: str) -> Dict[str, np.ndarray]:
+        """
+        Get a platform's running engagement and impressions totals.
+        
+        Args:
+            platform: Platform name
+            
+        Returns:
+            Dict with the frame's "dates" (datetime64[D]), "engagement" and
+            "impressions" prefix sums, and (rows, 24) "hourly_sum" and
+            "hourly_count" prefix sums of the hourly engagement; each has one
+            more row than "dates" and starts at 0
+        """
+        import numpy as np
+        prefix = self._prefix.get(platform)
+        if prefix is None:
+            frame = self._get_frame(platform)
+            prefix = {"dates": frame.index.to_numpy(dtype="datetime64[D]")}
+            for column in ("engagement", "impressions"):
+                totals = np.zeros(len(frame) + 1)
+                if column in frame.columns:
+                    np.cumsum(frame[column].to_numpy(dtype=float, na_value=0.0), out=totals[1:])
+                prefix[column] = totals
+            hourly = self._get_hourly(platform)
+            recorded = ~np.isnan(hourly)
+            prefix["hourly_sum"] = np.zeros((len(frame) + 1, 24))
+            np.cumsum(np.where(recorded, hourly, 0.0), axis=0, out=prefix["hourly_sum"][1:])
+            prefix["hourly_count"] = np.zeros((len(frame) + 1, 24), dtype=np.int64)
+            np.cumsum(recorded, axis=0, out=prefix["hourly_count"][1:])
+            self._prefix[platform] = prefix
+        return prefix
+    
+    def _get_window(self, platform: str, start_date: datetime.date, end_date: datetime.date) -> pd.DataFrame:
+        """
+        Get the rows of a platform's metrics frame within a date range.
+        
+        Args:
+            platform: Platform name
+            start_date: First date of the range (inclusive)
+            end_date: Last date of the range (inclusive)
+            
+        Returns:
+            DataFrame slice covering the date range
+        """
+        import pandas as pd
+        frame = self._get_frame(platform)
+        return frame.loc[pd.Timestamp(start_date):pd.Timestamp(end_date)]
+    
     def get_metrics(self, platform: str, start_date: str, end_date: str = None) -> Dict:
         """
         Get metrics for a platform within a date range.
@@ -111,18 +263,86 @@ class AnalyticsEngine:
             logger.warning(f"No metrics available for platform {platform}")
             return {}
         
-        # Convert dates to datetime objects for comparison
-        start = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
-        end = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
+        # Normalize the dates so they compare correctly with the stored keys
+        start = datetime.date.fromisoformat(start_date).isoformat()
+        end = datetime.date.fromisoformat(end_date).isoformat()
         
         # Filter metrics within date range
-        result = {}
-        for date_str, metrics in self.metrics_store[platform].items():
-            date = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
-            if start <= date <= end:
-                result[date_str] = metrics
+        store = self.metrics_store[platform]
+        return {date_str: store[date_str] for date_str in self._get_dates(platform, start, end)}
+    
+    def save_metrics(self, file_path: str) -> bool:
+        """
+        Save the stored metrics to a Parquet file.
+        
+        Numeric metrics are written as typed columns; other fields (such as
+        per-post content or hourly engagement) are kept in a JSON column.
+        
+        Args:
+            file_path: Path to save the metrics to
+            
+        Returns:
+            bool: Success status
+        """
+        import pandas as pd
+        try:
+            rows = []
+            for platform, platform_metrics in self.metrics_store.items():
+                for date_str, metrics in platform_metrics.items():
+                    row = {"platform": platform, "date": date_str}
+                    extra = {}
+                    for name, value in metrics.items():
+                        if (name not in _RESERVED_COLUMNS and isinstance(value, (int, float))
+                                and not isinstance(value, bool)):
+                            row[name] = value
+                        else:
+                            extra[name] = value
+                    row["extra"] = json.dumps(extra)
+                    rows.append(row)
+            
+            table = pd.DataFrame(rows, columns=None if rows else list(_RESERVED_COLUMNS))
+            table.convert_dtypes().to_parquet(file_path, index=False)
+            logger.info(f"Saved metrics to {file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving metrics: {e}")
+            return False
+    
+    def load_metrics(self, file_path: str) -> bool:
+        """
+        Load metrics from a Parquet file written by save_metrics.
         
-        return result
+        Args:
+            file_path: Path to load the metrics from
+            
+        Returns:
+            bool: Success status
+        """
+        import pandas as pd
+        if not os.path.exists(file_path):
+            logger.error(f"Metrics file {file_path} does not exist")
+            return False
+        
+        try:
+            table = pd.read_parquet(file_path, dtype_backend="numpy_nullable")
+            metric_columns = [name for name in table.columns if name not in _RESERVED_COLUMNS]
+            
+            metrics_store = {}
+            for record in table.to_dict("records"):
+                metrics = {name: record[name] for name in metric_columns if not pd.isna(record[name])}
+                metrics.update(json.loads(record["extra"]))
+                metrics_store.setdefault(record["platform"], {})[record["date"]] = metrics
+            
+            self.metrics_store = metrics_store
+            self._sorted_dates = {platform: sorted(dates) for platform, dates in metrics_store.items()}
+            self._frames = {}
+            self._hourly = {}
+            self._prefix = {}
+            logger.info(f"Loaded metrics from {file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error loading metrics: {e}")
+            return False
     
     def calculate_engagement_rate(self, platform: str, period: int = 7) -> float:
         """
@@ -135,6 +355,7 @@ class AnalyticsEngine:
         Returns:
             float: Average engagement rate
         """
+        import numpy as np
         if platform not in self.metrics_store:
             logger.warning(f"No metrics available for platform {platform}")
             return 0.0
@@ -143,24 +364,16 @@ class AnalyticsEngine:
         end_date = datetime.date.today()
         start_date = end_date - datetime.timedelta(days=period)
         
-        total_engagement = 0
-        total_impressions = 0
-        
-        # Iterate through dates in the period
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            
-            if date_str in self.metrics_store[platform]:
-                metrics = self.metrics_store[platform][date_str]
-                total_engagement += metrics.get("engagement", 0)
-                total_impressions += metrics.get("impressions", 0)
-            
-            current_date += datetime.timedelta(days=1)
+        # Sum the metrics over the dates in the period from the running totals
+        prefix = self._get_prefix(platform)
+        i = np.searchsorted(prefix["dates"], np.datetime64(start_date, "D"))
+        j = np.searchsorted(prefix["dates"], np.datetime64(end_date, "D"), side="right")
+        total_engagement = prefix["engagement"][j] - prefix["engagement"][i]
+        total_impressions = prefix["impressions"][j] - prefix["impressions"][i]
         
         # Calculate engagement rate
         if total_impressions > 0:
-            engagement_rate = total_engagement / total_impressions
+            engagement_rate = float(total_engagement / total_impressions)
         else:
             engagement_rate = 0.0
         
@@ -185,17 +398,20 @@ class AnalyticsEngine:
         end_date = datetime.date.today()
         start_date = end_date - datetime.timedelta(days=period)
         
-        start_date_str = start_date.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
+        start_date_str = start_date.isoformat()
+        end_date_str = end_date.isoformat()
         
-        # Get follower counts
-        start_followers = 0
-        if start_date_str in self.metrics_store[platform]:
-            start_followers = self.metrics_store[platform][start_date_str].get("followers", 0)
+        # Get follower counts from the first and last stored dates in the period,
+        # so a missing day at either end does not zero the result
+        dates = self._sorted_dates[platform]
+        first = bisect.bisect_left(dates, start_date_str)
+        last = bisect.bisect_right(dates, end_date_str) - 1
         
+        start_followers = 0
         end_followers = 0
-        if end_date_str in self.metrics_store[platform]:
-            end_followers = self.metrics_store[platform][end_date_str].get("followers", 0)
+        if first <= last:
+            start_followers = self.metrics_store[platform][dates[first]].get("followers", 0)
+            end_followers = self.metrics_store[platform][dates[last]].get("followers", 0)
         
         # Calculate growth rate
         if start_followers > 0:
@@ -217,6 +433,8 @@ class AnalyticsEngine:
         Returns:
             Dict containing trend information
         """
+        import numpy as np
+        import pandas as pd
         if platform not in self.metrics_store:
             logger.warning(f"No metrics available for platform {platform}")
             return {"trend": "unknown", "slope": 0.0, "confidence": 0.0}
@@ -226,42 +444,33 @@ class AnalyticsEngine:
         start_date = end_date - datetime.timedelta(days=period)
         
         # Collect metric values
-        dates = []
-        values = []
-        
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            
-            if date_str in self.metrics_store[platform]:
-                metrics = self.metrics_store[platform][date_str]
-                if metric in metrics:
-                    dates.append((current_date - start_date).days)
-                    values.append(metrics[metric])
-            
-            current_date += datetime.timedelta(days=1)
+        window = self._get_window(platform, start_date, end_date)
+        if metric not in window.columns:
+            return {"trend": "unknown", "slope": 0.0, "confidence": 0.0}
+        series = window[metric].dropna()
         
         # If we don't have enough data, return unknown trend
-        if len(dates) < 3:
+        if len(series) < 3:
             return {"trend": "unknown", "slope": 0.0, "confidence": 0.0}
         
         # Calculate trend using linear regression
         try:
-            # Convert to numpy arrays
-            x = np.array(dates)
-            y = np.array(values)
-            
-            # Add constant for intercept
-            X = np.vstack([x, np.ones(len(x))]).T
+            # Convert to numpy arrays (x is days since the start of the period)
+            x = (series.index - pd.Timestamp(start_date)).days.to_numpy(dtype=np.float64)
+            y = series.to_numpy(dtype=np.float64)
             
-            # Perform linear regression
-            slope, intercept = np.linalg.lstsq(X, y, rcond=None)[0]
+            # Perform simple linear regression from the closed-form sums
+            n = len(x)
+            sx = x.sum()
+            sy = y.sum()
+            sxx = x @ x
+            sxy = x @ y
+            slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
             
-            # Calculate R-squared
-            y_pred = slope * x + intercept
-            ss_total = np.sum((y - np.mean(y)) ** 2)
-            ss_residual = np.sum((y - y_pred) ** 2)
-            r_squared = 1 - (ss_residual / ss_total)
+            # Calculate R-squared (a constant series is fit exactly)
+            ss_total = y @ y - sy * sy / n
+            ss_residual = ss_total - slope * (sxy - sx * sy / n)
+            r_squared = 1 - (ss_residual / ss_total) if ss_total > 0 else 1.0
             
             # Determine trend direction
             if slope > 0.01:
@@ -280,6 +489,19 @@ class AnalyticsEngine:
             logger.error(f"Error calculating trend: {e}")
             return {"trend": "unknown", "slope": 0.0, "confidence": 0.0}
     
+    def _get_benchmark_frame(self) -> pd.DataFrame:
+        """
+        Get the benchmarks as a platforms x metrics frame.
+        
+        Returns:
+            DataFrame indexed by platform with one float column per metric
+        """
+        import pandas as pd
+        
+        if self._bench_df is None:
+            self._bench_df = pd.DataFrame(self.platform_benchmarks).T.astype(float)
+        return self._bench_df
+    
     def compare_to_benchmark(self, platform: str, metric: str, value: float) -> Dict:
         """
         Compare a metric value to the benchmark for a platform.
@@ -292,15 +514,11 @@ class AnalyticsEngine:
         Returns:
             Dict containing comparison information
         """
-        if platform not in self.platform_benchmarks:
-            logger.warning(f"No benchmarks available for platform {platform}")
-            return {"status": "unknown", "difference": 0.0}
-        
-        if metric not in self.platform_benchmarks[platform]:
+        benchmark = self._flat_bench.get((platform, metric))
+        if benchmark is None:
             logger.warning(f"No benchmark for metric {metric} on platform {platform}")
             return {"status": "unknown", "difference": 0.0}
         
-        benchmark = self.platform_benchmarks[platform][metric]
         difference = value - benchmark
         percentage_diff = (difference / benchmark) * 100 if benchmark > 0 else 0.0
         
@@ -319,6 +537,45 @@ class AnalyticsEngine:
             "benchmark": benchmark
         }
     
+    def compare_many(self, platform: str, values: pd.Series) -> pd.DataFrame:
+        """
+        Compare several metric values to the benchmarks for a platform at once.
+        
+        Args:
+            platform: Platform name
+            values: Metric values indexed by metric name
+            
+        Returns:
+            DataFrame indexed by metric with status, difference,
+            percentage_diff and benchmark columns
+        """
+        import numpy as np
+        import pandas as pd
+        
+        bench_df = self._get_benchmark_frame()
+        if platform in bench_df.index:
+            benchmark = bench_df.loc[platform].reindex(values.index)
+        else:
+            logger.warning(f"No benchmarks available for platform {platform}")
+            benchmark = pd.Series(np.nan, index=values.index)
+        
+        values = values.astype(float)
+        known = benchmark.notna()
+        difference = (values - benchmark).where(known, 0.0)
+        percentage_diff = (difference / benchmark * 100).where(benchmark > 0, 0.0)
+        status = np.select(
+            [~known, percentage_diff >= 10, percentage_diff <= -10],
+            ["unknown", "above", "below"],
+            default="on_par"
+        )
+        
+        return pd.DataFrame({
+            "status": status,
+            "difference": difference,
+            "percentage_diff": percentage_diff,
+            "benchmark": benchmark
+        }, index=values.index)
+    
     def get_best_performing_content(self, platform: str, period: int = 30, metric: str = "engagement") -> List[Dict]:
         """
         Get the best performing content for a platform.
@@ -331,6 +588,7 @@ class AnalyticsEngine:
         Returns:
             List of content items sorted by performance
         """
+        import numpy as np
         if platform not in self.metrics_store:
             logger.warning(f"No metrics available for platform {platform}")
             return []
@@ -342,28 +600,26 @@ class AnalyticsEngine:
         # Collect content items with metrics
         content_items = []
         
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            
-            if date_str in self.metrics_store[platform]:
-                metrics = self.metrics_store[platform][date_str]
-                
-                if "content" in metrics:
-                    for content in metrics["content"]:
-                        if metric in content.get("metrics", {}):
-                            content_items.append(content)
+        for date_str in self._get_dates(platform, start_date.isoformat(), end_date.isoformat()):
+            metrics = self.metrics_store[platform][date_str]
             
-            current_date += datetime.timedelta(days=1)
-        
-        # Sort by the specified metric
-        sorted_content = sorted(
-            content_items,
-            key=lambda x: x.get("metrics", {}).get(metric, 0),
-            reverse=True
+            if "content" in metrics:
+                for content in metrics["content"]:
+                    if metric in content.get("metrics", {}):
+                        content_items.append(content)
+        
+        # Select the top 10 by the specified metric, then sort just those
+        values = np.fromiter(
+            (content["metrics"][metric] for content in content_items),
+            dtype=np.float64,
+            count=len(content_items)
         )
+        top = np.arange(len(values))
+        if len(values) > 10:
+            top = np.sort(np.argpartition(-values, 9)[:10])
+        top = top[np.argsort(-values[top], kind="stable")]
         
-        return sorted_content[:10]  # Return top 10
+        return [content_items[i] for i in top]
     
     def get_optimal_posting_times(self, platform: str, period: int = 30) -> Dict:
         """
@@ -376,6 +632,7 @@ class AnalyticsEngine:
         Returns:
             Dict containing optimal posting times
         """
+        import numpy as np
         if platform not in self.metrics_store:
             logger.warning(f"No metrics available for platform {platform}")
             return {"times": ["12:00"], "confidence": 0.0}
@@ -384,50 +641,35 @@ class AnalyticsEngine:
         end_date = datetime.date.today()
         start_date = end_date - datetime.timedelta(days=period)
         
-        # Collect hourly engagement data
-        hourly_engagement = defaultdict(list)
-        
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            
-            if date_str in self.metrics_store[platform]:
-                metrics = self.metrics_store[platform][date_str]
-                
-                if "hourly_engagement" in metrics:
-                    for hour, engagement in metrics["hourly_engagement"].items():
-                        hour_int = int(hour)
-                        hourly_engagement[hour_int].append(engagement)
-            
-            current_date += datetime.timedelta(days=1)
+        # Total hourly engagement and data points for the days in the period
+        prefix = self._get_prefix(platform)
+        i = np.searchsorted(prefix["dates"], np.datetime64(start_date, "D"))
+        j = np.searchsorted(prefix["dates"], np.datetime64(end_date, "D"), side="right")
+        sums = prefix["hourly_sum"][j] - prefix["hourly_sum"][i]
+        counts = prefix["hourly_count"][j] - prefix["hourly_count"][i]
         
         # Calculate average engagement for each hour
-        avg_engagement = {}
-        for hour, values in hourly_engagement.items():
-            if values:
-                avg_engagement[hour] = sum(values) / len(values)
+        avg_engagement = np.divide(sums, counts, out=np.full(24, np.nan), where=counts > 0)
+        hours_with_data = np.flatnonzero(counts)
         
         # If we don't have enough data, return default time
-        if not avg_engagement:
+        if len(hours_with_data) == 0:
             return {"times": ["12:00"], "confidence": 0.0}
         
-        # Sort hours by average engagement
-        sorted_hours = sorted(
-            avg_engagement.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
-        # Get top 3 hours
-        top_hours = sorted_hours[:3]
+        # Partition out the top 3 hours by average engagement, then order them
+        candidates = -avg_engagement[hours_with_data]
+        if len(candidates) > 3:
+            top = np.sort(np.argpartition(candidates, 2)[:3])
+        else:
+            top = np.arange(len(candidates))
+        top_hours = hours_with_data[top[np.argsort(candidates[top], kind="stable")]]
         
         # Format as time strings
-        optimal_times = [f"{hour:02d}:00" for hour, _ in top_hours]
+        optimal_times = [f"{hour:02d}:00" for hour in top_hours]
         
         # Calculate confidence based on data points
         total_days = (end_date - start_date).days + 1
-        data_points = sum(len(values) for values in hourly_engagement.values())
-        confidence = min(1.0, data_points / (total_days * 24 * 0.5))
+        confidence = min(1.0, int(counts.sum()) / (total_days * 12))
         
         return {
             "times": optimal_times,
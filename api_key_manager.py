@@ -9,13 +9,49 @@ import logging
 import json
 import os
 import base64
-from typing import Dict, List, Optional, Any
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+import collections
+import contextlib
+import functools
+import hashlib
+import time
+from typing import Dict, Iterator, List, Optional, Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger("llm_integration.api_key_manager")
 
+# Seconds a validate_key result is reused before the service is asked again
+VALIDATION_TTL = 60.0
+
+# Decrypted keys kept by get_key: at most PLAIN_CACHE_SIZE of them, each for
+# PLAIN_CACHE_TTL seconds, so plaintext keys do not stay in memory for the
+# life of the process
+PLAIN_CACHE_SIZE = 32
+PLAIN_CACHE_TTL = 300.0
+
+# Statuses that definitely mean a key was rejected; other failures (rate
+# limits, server errors) say nothing about the key and are not cached
+_REJECTED_STATUSES = frozenset({401, 403})
+
+@functools.lru_cache(maxsize=8)
+def _derive_key(password: bytes, salt: bytes) -> bytes:
+    """
+    Derive a Fernet key from a password with PBKDF2-HMAC-SHA256.
+    
+    The derivation is deliberately slow, so results are cached per process.
+    
+    Args:
+        password: Master password
+        salt: Salt for the key derivation
+        
+    Returns:
+        bytes: URL-safe base64-encoded 32-byte key
+    """
+    return base64.urlsafe_b64encode(hashlib.pbkdf2_hmac("sha256", password, salt, 100000, dklen=32))
+
 class APIKeyManager:
     """
     API Key Manager for securely storing and retrieving API keys.
@@ -40,6 +76,19 @@ class APIKeyManager:
         self.keys = {}
         self.cipher_suite = None
         
+        # Recently used decrypted keys as (service, key_type) -> (expiry, key),
+        # least recently used first; dropped whenever the stored keys change
+        self._plain_cache = collections.OrderedDict()
+        
+        # Shared HTTP session for key validation (created on first use) and
+        # recent definite validation results as (service, key_type) -> (timestamp, valid)
+        self._http = None
+        self._validated = {}
+        
+        # Nesting depth of batch() blocks and whether a save was deferred
+        self._batch_depth = 0
+        self._dirty = False
+        
         # Initialize encryption
         self._initialize_encryption()
         
@@ -53,6 +102,9 @@ class APIKeyManager:
         """
         Initialize the encryption system.
         """
+        # Imported here so that importing this module does not load OpenSSL
+        from cryptography.fernet import Fernet
+        
         if not self.master_password:
             # Use environment variable if available
             self.master_password = os.environ.get("API_KEY_MASTER_PASSWORD", "default_password")
@@ -61,14 +113,7 @@ class APIKeyManager:
         password = self.master_password.encode()
         salt = b'social_media_agent_salt'  # In production, this should be stored securely
         
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000
-        )
-        
-        key = base64.urlsafe_b64encode(kdf.derive(password))
+        key = _derive_key(password, salt)
         self.cipher_suite = Fernet(key)
     
     def add_key(self, service: str, key_type: str, key_value: str) -> bool:
@@ -95,6 +140,8 @@ class APIKeyManager:
         
         # Store the encrypted key
         self.keys[service][key_type] = encrypted_key
+        self._plain_cache.pop((service, key_type), None)
+        self._validated.pop((service, key_type), None)
         
         # Save to file
         return self.save_keys()
@@ -110,6 +157,14 @@ class APIKeyManager:
         Returns:
             str: The API key or None if not found
         """
+        cache_key = (service, key_type)
+        cached = self._plain_cache.get(cache_key)
+        if cached is not None:
+            if time.monotonic() < cached[0]:
+                self._plain_cache.move_to_end(cache_key)
+                return cached[1]
+            del self._plain_cache[cache_key]
+        
         if service not in self.keys or key_type not in self.keys[service]:
             logger.warning(f"Key not found: {service}.{key_type}")
             return None
@@ -120,6 +175,9 @@ class APIKeyManager:
         # Decrypt the key
         try:
             decrypted_key = self.cipher_suite.decrypt(encrypted_key.encode()).decode()
+            self._plain_cache[cache_key] = (time.monotonic() + PLAIN_CACHE_TTL, decrypted_key)
+            if len(self._plain_cache) > PLAIN_CACHE_SIZE:
+                self._plain_cache.popitem(last=False)
             return decrypted_key
         except Exception as e:
             logger.error(f"Error decrypting key: {e}")
@@ -142,6 +200,8 @@ class APIKeyManager:
         
         # Remove the key
         del self.keys[service][key_type]
+        self._plain_cache.pop((service, key_type), None)
+        self._validated.pop((service, key_type), None)
         
         # If no keys left for the service, remove the service
         if not self.keys[service]:
@@ -164,17 +224,8 @@ class APIKeyManager:
             logger.warning(f"Service not found: {service}")
             return {}
         
-        # Get all keys for the service
-        service_keys = {}
-        for key_type, encrypted_key in self.keys[service].items():
-            try:
-                decrypted_key = self.cipher_suite.decrypt(encrypted_key.encode()).decode()
-                service_keys[key_type] = decrypted_key
-            except Exception as e:
-                logger.error(f"Error decrypting key: {e}")
-                service_keys[key_type] = None
-        
-        return service_keys
+        # Get all keys for the service, through get_key's bounded cache
+        return {key_type: self.get_key(service, key_type) for key_type in self.keys[service]}
     
     def get_all_services(self) -> List[str]:
         """
@@ -185,6 +236,35 @@ class APIKeyManager:
         """
         return list(self.keys.keys())
     
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["APIKeyManager"]:
+        """
+        Defer saving keys until the end of a block of changes.
+        
+        Inside the block, save_keys (and so add_key/remove_key) only marks the
+        keys as changed; the file is written once when the outermost block exits.
+        If the block exits with an exception, nothing is written: the changes
+        stay in memory, unsaved, until the next save_keys().
+        
+        Returns:
+            Iterator yielding this manager
+            
+        Raises:
+            OSError: If the keys could not be saved at the end of the block
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                logger.error("API key batch aborted by an error; changes were not saved")
+            raise
+        
+        self._batch_depth -= 1
+        if self._batch_depth == 0 and self._dirty and not self.save_keys():
+            raise OSError(f"Could not save API keys to {self.config_path}")
+    
     def save_keys(self) -> bool:
         """
         Save keys to the configuration file.
@@ -192,12 +272,21 @@ class APIKeyManager:
         Returns:
             bool: Success status
         """
+        if self._batch_depth > 0:
+            self._dirty = True
+            return True
+        
+        self._dirty = False
         try:
             # Ensure directory exists
             os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
             
-            with open(self.config_path, 'w') as f:
-                json.dump(self.keys, f, indent=2)
+            if orjson is not None:
+                with open(self.config_path, 'wb') as f:
+                    f.write(orjson.dumps(self.keys, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.config_path, 'w') as f:
+                    json.dump(self.keys, f, indent=2)
             
             logger.info(f"Saved API keys to {self.config_path}")
             return True
@@ -213,8 +302,11 @@ class APIKeyManager:
             bool: Success status
         """
         try:
-            with open(self.config_path, 'r') as f:
-                self.keys = json.load(f)
+            with open(self.config_path, 'rb') as f:
+                data = f.read()
+            self.keys = orjson.loads(data) if orjson is not None else json.loads(data)
+            self._plain_cache.clear()
+            self._validated.clear()
             
             logger.info(f"Loaded API keys from {self.config_path}")
             return True
@@ -239,14 +331,26 @@ class APIKeyManager:
         
         # Implement service-specific validation
         if service == "openai":
-            import requests
+            cached = self._validated.get((service, key_type))
+            if cached is not None and time.monotonic() - cached[0] < VALIDATION_TTL:
+                return cached[1]
+            
+            if self._http is None:
+                import requests
+                self._http = requests.Session()
             headers = {"Authorization": f"Bearer {key}"}
             try:
-                response = requests.get("https://api.openai.com/v1/models", headers=headers)
-                return response.status_code == 200
+                response = self._http.get("https://api.openai.com/v1/models", headers=headers, timeout=3.0)
             except Exception as e:
                 logger.error(f"Error validating OpenAI key: {e}")
                 return False
+            
+            valid = response.status_code == 200
+            if valid or response.status_code in _REJECTED_STATUSES:
+                self._validated[(service, key_type)] = (time.monotonic(), valid)
+            else:
+                logger.warning(f"Could not validate OpenAI key: HTTP {response.status_code}")
+            return valid
         
         # For other services, just check if the key exists
         return True
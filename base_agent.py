@@ -20,6 +20,8 @@ class BasePlatformAgent(abc.ABC):
     to ensure consistent functionality across different platforms.
     """
     
+    __slots__ = ('config', 'platform_name', 'api_client', 'metrics_cache')
+    
     def __init__(self, config: Dict = None):
         """
         Initialize the platform agent.
@@ -1,38 +1,27 @@
 """
 Base Image Generation Provider interface.
 
-This module defines the abstract base class that all image generation providers
+This module defines the base class that all image generation providers
 must implement to ensure consistent functionality across different providers.
 """
 
-import abc
 import logging
 from typing import Dict, List, Optional, Any
 
+from .base_provider import BaseProvider
+
 logger = logging.getLogger("llm_integration.base_image_generator")
 
-class BaseImageGenerator(abc.ABC):
+class BaseImageGenerator(BaseProvider):
     """
-    Abstract base class for image generation providers.
+    Base class for image generation providers.
     
     This class defines the interface that all image generation providers must implement
     to ensure consistent functionality across different providers.
     """
     
-    def __init__(self, config: Dict = None):
-        """
-        Initialize the image generation provider.
-        
-        Args:
-            config: Configuration dictionary
-        """
-        self.config = config or {}
-        self.provider_name = "base"
-        self.api_key = self.config.get("api_key")
-        
-        logger.info(f"Base Image Generator initialized")
+    __slots__ = ()
     
-    @abc.abstractmethod
     def generate_image(self, prompt: str, size: str = "1024x1024", 
                       style: str = "natural", format: str = "url") -> Dict:
         """
@@ -47,9 +36,8 @@ class BaseImageGenerator(abc.ABC):
         Returns:
             Dict containing the generated image data
         """
-        pass
+        raise NotImplementedError
     
-    @abc.abstractmethod
     def generate_social_media_image(self, platform: str, topic: str, 
                                    style: str = "professional") -> Dict:
         """
@@ -63,9 +51,8 @@ class BaseImageGenerator(abc.ABC):
         Returns:
             Dict containing the generated image data
         """
-        pass
+        raise NotImplementedError
     
-    @abc.abstractmethod
     def generate_variations(self, image_path: str, variations: int = 3) -> List[Dict]:
         """
         Generate variations of an existing image.
@@ -77,9 +64,8 @@ class BaseImageGenerator(abc.ABC):
         Returns:
             List of dictionaries containing the generated image variations
         """
-        pass
+        raise NotImplementedError
     
-    @abc.abstractmethod
     def optimize_for_platform(self, image_path: str, platform: str) -> Dict:
         """
         Optimize an image for a specific platform.
@@ -91,17 +77,4 @@ class BaseImageGenerator(abc.ABC):
         Returns:
             Dict containing the optimized image data
         """
-        pass
-    
-    def validate_api_key(self) -> bool:
-        """
-        Validate the API key.
-        
-        Returns:
-            bool: Whether the API key is valid
-        """
-        if not self.api_key:
-            logger.error(f"No API key provided for {self.provider_name}")
-            return False
-        
-        return True
+        raise NotImplementedError
@@ -0,0 +1,199 @@
+"""
+Base provider shared by the text LLM and image generation interfaces.
+
+This module holds the configuration and API key handling that every
+LLM and image generation provider has in common.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("llm_integration.base_provider")
+
+# Connections kept alive per host by new_http_session
+HTTP_POOL_SIZE = 32
+
+# Responses new_http_session retries (with exponential backoff) for idempotent requests
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def new_http_session(retries: int = 3, backoff_factor: float = 0.5) -> Any:
+    """
+    Create a requests session that keeps connections to each host alive.
+    
+    Failed connections are retried for every request, and HTTP_RETRY_STATUSES
+    responses for idempotent ones (so image generations are never billed twice),
+    waiting as long as a Retry-After header asks.
+    
+    Args:
+        retries: Most retries per request
+        backoff_factor: Exponential backoff between retries, in seconds
+        
+    Returns:
+        requests.Session with a connection pool of HTTP_POOL_SIZE per host
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=HTTP_RETRY_STATUSES)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    
+    The rate can be changed while the bucket is in use, by setting rate.
+    """
+    
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Initialize the bucket full.
+        
+        Args:
+            rate: Tokens added per second (must be positive)
+            burst: Most tokens held at once (default: one second's worth, at least 1)
+            
+        Raises:
+            ValueError: If rate is not positive
+        """
+        if not rate > 0:
+            raise ValueError(f"TokenBucket rate must be positive, got {rate!r}")
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """
+        Take a token, sleeping until one is available.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+class BaseProvider:
+    """
+    Common base class for text LLM and image generation providers.
+    
+    This class handles:
+    - Provider configuration and API key
+    - API key validation, with successful validations cached for a TTL
+    - The HTTP session used for API calls
+    
+    Implementations make their HTTP requests through http() so that the
+    connection pool can be shared; a session can be injected with the
+    "session" config key or set_session(), otherwise one is created on first use.
+    """
+    
+    __slots__ = ('config', 'provider_name', 'api_key', 'session', '_owns_session',
+                 '_session_lock', '_validation_cache', '_validation_ttl')
+    
+    def __init__(self, config: Dict = None):
+        """
+        Initialize the provider.
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config or {}
+        self.provider_name = "base"
+        self.api_key = self.config.get("api_key")
+        self.session = self.config.get("session")
+        self._owns_session = False
+        # Guards creating the session in http() when providers are used from several threads
+        self._session_lock = threading.Lock()
+        
+        # Last successful validation as (result, time.monotonic() timestamp)
+        self._validation_cache = (None, 0.0)
+        self._validation_ttl = self.config.get("validation_ttl", 300)
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s base initialized", type(self).__name__)
+    
+    def set_session(self, session: Any) -> None:
+        """
+        Use a shared HTTP session for API calls.
+        
+        Args:
+            session: requests.Session (or compatible) to send requests through
+        """
+        if self._owns_session:
+            self.close()
+        self.session = session
+    
+    def http(self) -> Any:
+        """
+        Get the HTTP session for API calls, creating a pooled one if none was set.
+        
+        Returns:
+            requests.Session used for API calls
+        """
+        session = self.session
+        if session is None:
+            with self._session_lock:
+                session = self.session
+                if session is None:
+                    session = self.session = new_http_session()
+                    self._owns_session = True
+        return session
+    
+    def close(self) -> None:
+        """
+        Close the HTTP session if this provider created it; shared sessions are left open.
+        """
+        if self._owns_session:
+            self.session.close()
+            self.session = None
+            self._owns_session = False
+    
+    def __del__(self):
+        # Attributes may be missing if __init__ failed
+        if getattr(self, "_owns_session", False):
+            self.close()
+    
+    def validate_api_key(self, force_recheck: bool = False) -> bool:
+        """
+        Validate the API key.
+        
+        A successful validation is reused for the validation TTL; providers
+        implement the actual check in _check_api_key.
+        
+        Args:
+            force_recheck: Check the key even if a cached validation is still fresh
+            
+        Returns:
+            bool: Whether the API key is valid
+        """
+        valid, checked_at = self._validation_cache
+        if valid and not force_recheck and time.monotonic() - checked_at < self._validation_ttl:
+            return True
+        
+        valid = self._check_api_key()
+        if valid:
+            self._validation_cache = (True, time.monotonic())
+        return valid
+    
+    def _check_api_key(self) -> bool:
+        """
+        Check the API key without using the validation cache.
+        
+        Returns:
+            bool: Whether the API key is valid
+        """
+        if not self.api_key:
+            logger.error("No API key provided for %s", self.provider_name)
+            return False
+        
+        return True
@@ -1,41 +1,58 @@
 """
 Base LLM Provider interface for text generation.
 
-This module defines the abstract base class that all text LLM providers
+This module defines the base class that all text LLM providers
 must implement to ensure consistent functionality across different providers.
 """
 
-import abc
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
+
+from .base_provider import BaseProvider
 
 logger = logging.getLogger("llm_integration.base_text_llm")
 
-class BaseTextLLM(abc.ABC):
+class StreamError(RuntimeError):
     """
-    Abstract base class for text LLM providers.
+    Raised by generate_text_stream when generation fails.
+    
+    Streams raise instead of yielding "Error: ..." text so that failures
+    cannot be mistaken for generated content.
+    """
+
+class BaseTextLLM(BaseProvider):
+    """
+    Base class for text LLM providers.
     
     This class defines the interface that all text LLM providers must implement
     to ensure consistent functionality across different providers.
     """
     
-    def __init__(self, config: Dict = None):
+    __slots__ = ()
+    
+    # Whether generate_text_stream yields output incrementally
+    supports_streaming = False
+    
+    def generate_text(self, prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> str:
         """
-        Initialize the text LLM provider.
+        Generate text based on a prompt.
         
         Args:
-            config: Configuration dictionary
+            prompt: Input prompt for text generation
+            max_tokens: Maximum number of tokens to generate
+            temperature: Controls randomness (0.0 to 1.0)
+            
+        Returns:
+            str: Generated text
         """
-        self.config = config or {}
-        self.provider_name = "base"
-        self.api_key = self.config.get("api_key")
-        
-        logger.info(f"Base Text LLM initialized")
+        raise NotImplementedError
     
-    @abc.abstractmethod
-    def generate_text(self, prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> str:
+    def generate_text_stream(self, prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> Iterator[str]:
         """
-        Generate text based on a prompt.
+        Generate text based on a prompt, yielding it in chunks as it is produced.
+        
+        Providers without a streaming API yield the full generate_text result
+        as a single chunk.
         
         Args:
             prompt: Input prompt for text generation
@@ -43,11 +60,16 @@ class BaseTextLLM(abc.ABC):
             temperature: Controls randomness (0.0 to 1.0)
             
         Returns:
-            str: Generated text
+            Iterator of generated text chunks
+            
+        Raises:
+            StreamError: If generation fails
         """
-        pass
+        text = self.generate_text(prompt, max_tokens=max_tokens, temperature=temperature)
+        if text.startswith("Error:"):
+            raise StreamError(text[len("Error:"):].strip())
+        yield text
     
-    @abc.abstractmethod
     def generate_social_media_post(self, platform: str, topic: str, tone: str = "professional", 
                                   hashtags: int = 3, emojis: bool = True) -> Dict:
         """
@@ -63,9 +85,8 @@ class BaseTextLLM(abc.ABC):
         Returns:
             Dict containing the generated post content
         """
-        pass
+        raise NotImplementedError
     
-    @abc.abstractmethod
     def generate_content_variations(self, content: str, variations: int = 3) -> List[str]:
         """
         Generate variations of existing content.
@@ -77,9 +98,8 @@ class BaseTextLLM(abc.ABC):
         Returns:
             List of content variations
         """
-        pass
+        raise NotImplementedError
     
-    @abc.abstractmethod
     def optimize_for_platform(self, content: str, platform: str) -> str:
         """
         Optimize content for a specific platform.
@@ -91,17 +111,4 @@ class BaseTextLLM(abc.ABC):
         Returns:
             str: Optimized content
         """
-        pass
-    
-    def validate_api_key(self) -> bool:
-        """
-        Validate the API key.
-        
-        Returns:
-            bool: Whether the API key is valid
-        """
-        if not self.api_key:
-            logger.error(f"No API key provided for {self.provider_name}")
-            return False
-        
-        return True
+        raise NotImplementedError
@@ -5,152 +5,258 @@ This file contains the configuration settings for the social media agent system,
 including API keys, platform settings, and scheduling preferences.
 """
 
+import functools
 import os
-from typing import Dict, Any
+from typing import Any, Dict
 
-# API Keys (replace with your actual API keys or use environment variables)
-API_KEYS = {
-    # LLM API Keys
-    "openai": os.environ.get("OPENAI_API_KEY", "your_openai_api_key_here"),
-    "anthropic": os.environ.get("ANTHROPIC_API_KEY", "your_anthropic_api_key_here"),
-    
-    # Social Media Platform API Keys
+# Environment variable behind each platform API key
+_PLATFORM_KEY_ENVS = {
     "facebook": {
-        "app_id": os.environ.get("FACEBOOK_APP_ID", "your_facebook_app_id_here"),
-        "app_secret": os.environ.get("FACEBOOK_APP_SECRET", "your_facebook_app_secret_here"),
-        "access_token": os.environ.get("FACEBOOK_ACCESS_TOKEN", "your_facebook_access_token_here"),
+        "app_id": "FACEBOOK_APP_ID",
+        "app_secret": "FACEBOOK_APP_SECRET",
+        "access_token": "FACEBOOK_ACCESS_TOKEN",
     },
     "twitter": {
-        "api_key": os.environ.get("TWITTER_API_KEY", "your_twitter_api_key_here"),
-        "api_secret": os.environ.get("TWITTER_API_SECRET", "your_twitter_api_secret_here"),
-        "access_token": os.environ.get("TWITTER_ACCESS_TOKEN", "your_twitter_access_token_here"),
-        "access_token_secret": os.environ.get("TWITTER_ACCESS_TOKEN_SECRET", "your_twitter_access_token_secret_here"),
+        "api_key": "TWITTER_API_KEY",
+        "api_secret": "TWITTER_API_SECRET",
+        "access_token": "TWITTER_ACCESS_TOKEN",
+        "access_token_secret": "TWITTER_ACCESS_TOKEN_SECRET",
     },
     "instagram": {
-        "username": os.environ.get("INSTAGRAM_USERNAME", "your_instagram_username_here"),
-        "password": os.environ.get("INSTAGRAM_PASSWORD", "your_instagram_password_here"),
-        "business_id": os.environ.get("INSTAGRAM_BUSINESS_ID", "your_instagram_business_id_here"),
+        "username": "INSTAGRAM_USERNAME",
+        "password": "INSTAGRAM_PASSWORD",
+        "business_id": "INSTAGRAM_BUSINESS_ID",
     },
     "tiktok": {
-        "app_id": os.environ.get("TIKTOK_APP_ID", "your_tiktok_app_id_here"),
-        "app_secret": os.environ.get("TIKTOK_APP_SECRET", "your_tiktok_app_secret_here"),
-        "access_token": os.environ.get("TIKTOK_ACCESS_TOKEN", "your_tiktok_access_token_here"),
+        "app_id": "TIKTOK_APP_ID",
+        "app_secret": "TIKTOK_APP_SECRET",
+        "access_token": "TIKTOK_ACCESS_TOKEN",
     }
 }
 
-# Platform Settings
-PLATFORM_SETTINGS = {
-    "facebook": {
-        "enabled": True,
-        "post_frequency": "daily",  # daily, alternate_days, weekly
-        "best_times": ["09:00", "15:00", "19:00"],  # Best times to post (24-hour format)
-        "content_types": ["text", "image", "link"],
-        "max_posts_per_day": 2,
-    },
-    "twitter": {
-        "enabled": True,
-        "post_frequency": "daily",
-        "best_times": ["08:00", "12:00", "17:00", "20:00"],
-        "content_types": ["text", "image", "poll"],
-        "max_posts_per_day": 5,
-    },
-    "instagram": {
-        "enabled": True,
-        "post_frequency": "alternate_days",  # every other day
-        "best_times": ["11:00", "17:00", "20:00"],
-        "content_types": ["image", "carousel", "reel"],
-        "max_posts_per_day": 1,
-    },
-    "tiktok": {
-        "enabled": True,
-        "post_frequency": "weekly",  # once per week
-        "best_times": ["15:00", "19:00", "21:00"],
-        "content_types": ["video"],
-        "max_posts_per_day": 1,
+# API Keys (replace with your actual API keys or use environment variables)
+def _build_api_keys() -> Dict[str, Any]:
+    """
+    Build the API keys from the environment.
+    
+    Unset platform keys default to a "your_<variable name>_here" placeholder.
+    
+    Returns:
+        Dict of API keys, with a dict of keys for each platform
+    """
+    api_keys = {
+        # LLM API Keys
+        "openai": os.environ.get("OPENAI_API_KEY", "your_openai_api_key_here"),
+        "anthropic": os.environ.get("ANTHROPIC_API_KEY", "your_anthropic_api_key_here"),
     }
-}
+    
+    # Social Media Platform API Keys
+    api_keys.update(
+        (platform, {key: os.environ.get(env, f"your_{env.lower()}_here") for key, env in envs.items()})
+        for platform, envs in _PLATFORM_KEY_ENVS.items()
+    )
+    return api_keys
 
-# Content Generation Settings
-CONTENT_SETTINGS = {
-    "business_name": "Your Business Name",
-    "business_description": "A brief description of your business and what you offer",
-    "business_industry": "Your Industry",
-    "target_audience": ["demographic1", "demographic2", "demographic3"],
-    "brand_voice": "professional",  # professional, casual, humorous, informative
-    "content_themes": [
-        "product_highlights",
-        "industry_news",
-        "tips_and_advice",
-        "behind_the_scenes",
-        "customer_stories"
-    ],
-    "hashtags": {
-        "primary": ["#yourbrand", "#yourindustry"],
-        "secondary": ["#relevant", "#hashtags", "#foryour", "#business"]
-    },
-    "competitor_accounts": [
-        "competitor1",
-        "competitor2",
-        "competitor3"
-    ]
-}
+def _build_platform_settings() -> Dict[str, Any]:
+    """
+    Build the platform settings.
+    
+    Returns:
+        Dict of platform settings
+    """
+    return {
+        "facebook": {
+            "enabled": True,
+            "post_frequency": "daily",  # daily, alternate_days, weekly
+            "best_times": ["09:00", "15:00", "19:00"],  # Best times to post (24-hour format)
+            "content_types": ["text", "image", "link"],
+            "max_posts_per_day": 2,
+        },
+        "twitter": {
+            "enabled": True,
+            "post_frequency": "daily",
+            "best_times": ["08:00", "12:00", "17:00", "20:00"],
+            "content_types": ["text", "image", "poll"],
+            "max_posts_per_day": 5,
+        },
+        "instagram": {
+            "enabled": True,
+            "post_frequency": "alternate_days",  # every other day
+            "best_times": ["11:00", "17:00", "20:00"],
+            "content_types": ["image", "carousel", "reel"],
+            "max_posts_per_day": 1,
+        },
+        "tiktok": {
+            "enabled": True,
+            "post_frequency": "weekly",  # once per week
+            "best_times": ["15:00", "19:00", "21:00"],
+            "content_types": ["video"],
+            "max_posts_per_day": 1,
+        }
+    }
 
-# LLM Settings
-LLM_SETTINGS = {
-    "text_provider": "openai",  # openai, anthropic, etc.
-    "text_model": "gpt-4",  # model name
-    "image_provider": "openai",
-    "image_model": "dall-e-3",
-    "temperature": 0.7,  # creativity level (0.0-1.0)
-    "max_tokens": 500,
-    "style_preferences": {
-        "facebook": "professional",
-        "twitter": "concise",
-        "instagram": "visual",
-        "tiktok": "trendy"
+def _build_content_settings() -> Dict[str, Any]:
+    """
+    Build the content generation settings.
+    
+    Returns:
+        Dict of content generation settings
+    """
+    return {
+        "business_name": "Your Business Name",
+        "business_description": "A brief description of your business and what you offer",
+        "business_industry": "Your Industry",
+        "target_audience": ["demographic1", "demographic2", "demographic3"],
+        "brand_voice": "professional",  # professional, casual, humorous, informative
+        "content_themes": [
+            "product_highlights",
+            "industry_news",
+            "tips_and_advice",
+            "behind_the_scenes",
+            "customer_stories"
+        ],
+        "hashtags": {
+            "primary": ["#yourbrand", "#yourindustry"],
+            "secondary": ["#relevant", "#hashtags", "#foryour", "#business"]
+        },
+        "competitor_accounts": [
+            "competitor1",
+            "competitor2",
+            "competitor3"
+        ]
     }
-}
 
-# Reporting Settings
-REPORTING_SETTINGS = {
-    "weekly_report_day": "Monday",
-    "weekly_report_time": "09:00",
-    "metrics_to_track": [
-        "engagement",
-        "impressions",
-        "followers",
-        "clicks",
-        "conversions"
-    ],
-    "email_recipients": [
-        "manager@example.com",
-        "team@example.com"
-    ],
-    "report_format": "html"  # html, pdf, json
-}
+def _build_llm_settings() -> Dict[str, Any]:
+    """
+    Build the LLM settings.
+    
+    Returns:
+        Dict of LLM settings
+    """
+    return {
+        "text_provider": "openai",  # openai, anthropic, etc.
+        "text_model": "gpt-4",  # model name
+        "image_provider": "openai",
+        "image_model": "dall-e-3",
+        "temperature": 0.7,  # creativity level (0.0-1.0)
+        "max_tokens": 500,
+        "style_preferences": {
+            "facebook": "professional",
+            "twitter": "concise",
+            "instagram": "visual",
+            "tiktok": "trendy"
+        }
+    }
+
+def _build_reporting_settings() -> Dict[str, Any]:
+    """
+    Build the reporting settings.
+    
+    Returns:
+        Dict of reporting settings
+    """
+    return {
+        "weekly_report_day": "Monday",
+        "weekly_report_time": "09:00",
+        "metrics_to_track": [
+            "engagement",
+            "impressions",
+            "followers",
+            "clicks",
+            "conversions"
+        ],
+        "email_recipients": [
+            "manager@example.com",
+            "team@example.com"
+        ],
+        "report_format": "html"  # html, pdf, json
+    }
+
+def _build_system_settings() -> Dict[str, Any]:
+    """
+    Build the system settings.
+    
+    Returns:
+        Dict of system settings
+    """
+    return {
+        "log_level": "INFO",  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+        "data_directory": "data",
+        "metrics_directory": "metrics",
+        "reports_directory": "reports",
+        "content_directory": "content",
+        "timezone": "UTC",
+    }
 
-# System Settings
-SYSTEM_SETTINGS = {
-    "log_level": "INFO",  # DEBUG, INFO, WARNING, ERROR, CRITICAL
-    "data_directory": "data",
-    "metrics_directory": "metrics",
-    "reports_directory": "reports",
-    "content_directory": "content",
-    "timezone": "UTC",
+# Top-level settings, each built by its function on first access
+_BUILDERS = {
+    "API_KEYS": _build_api_keys,
+    "PLATFORM_SETTINGS": _build_platform_settings,
+    "CONTENT_SETTINGS": _build_content_settings,
+    "LLM_SETTINGS": _build_llm_settings,
+    "REPORTING_SETTINGS": _build_reporting_settings,
+    "SYSTEM_SETTINGS": _build_system_settings
 }
 
+def __getattr__(name: str) -> Any:
+    """
+    Build a top-level settings dict on first access and keep it as a module global.
+    
+    Args:
+        name: Attribute name
+        
+    Returns:
+        The settings dict
+    """
+    builder = _BUILDERS.get(name)
+    if builder is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = builder()
+    return value
+
+def _setting(name: str) -> Any:
+    """
+    Get a top-level settings dict, building it if needed.
+    
+    Args:
+        name: Settings name (e.g. "API_KEYS")
+        
+    Returns:
+        The settings dict
+    """
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+def reload_config() -> None:
+    """
+    Re-read the API keys from the environment.
+    
+    Call after changing the API key environment variables; API_KEYS and
+    get_config() reflect the new values from the next access on.
+    """
+    globals().pop("API_KEYS", None)
+    get_config.cache_clear()
+
+@functools.lru_cache(maxsize=1)
 def get_config() -> Dict[str, Any]:
     """
     Get the complete configuration dictionary.
     
+    The dictionary is built once and shared by all callers, along with the
+    settings dicts it holds, so callers must not modify it; copy what needs
+    changing. API keys are read from the environment on first use (see
+    reload_config).
+    
     Returns:
         Dict containing all configuration settings
     """
     return {
-        "api_keys": API_KEYS,
-        "platform_settings": PLATFORM_SETTINGS,
-        "content_settings": CONTENT_SETTINGS,
-        "llm_settings": LLM_SETTINGS,
-        "reporting_settings": REPORTING_SETTINGS,
-        "system_settings": SYSTEM_SETTINGS
+        "api_keys": _setting("API_KEYS"),
+        "platform_settings": _setting("PLATFORM_SETTINGS"),
+        "content_settings": _setting("CONTENT_SETTINGS"),
+        "llm_settings": _setting("LLM_SETTINGS"),
+        "reporting_settings": _setting("REPORTING_SETTINGS"),
+        "system_settings": _setting("SYSTEM_SETTINGS")
     }
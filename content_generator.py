@@ -5,15 +5,104 @@ This module defines the base content generator class that handles
 the generation of content for social media platforms.
 """
 
+from __future__ import annotations
+
 import logging
 import datetime
-from typing import Dict, List, Optional, Any
+import collections
+import concurrent.futures
+import copy
+import dataclasses
+import itertools
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any
 
-from ..llm_integration.base_text_llm import BaseTextLLM
-from ..llm_integration.base_image_generator import BaseImageGenerator
+if TYPE_CHECKING:
+    from ..llm_integration.base_text_llm import BaseTextLLM
+    from ..llm_integration.base_image_generator import BaseImageGenerator
 
 logger = logging.getLogger("content_generation.content_generator")
 
+# Timestamps are recorded in UTC
+_UTC = datetime.timezone.utc
+
+@dataclasses.dataclass(slots=True)
+class ContentResult:
+    """
+    Record of one content generation call, as kept in the content history.
+    
+    Attributes:
+        content_type: Type of content generated (text, image, combined)
+        platform: Target social media platform
+        topic: Topic or subject of the content
+        tone: Tone of the text content, if any
+        style: Style of the image content, if any
+        generated_at: ISO timestamp of the generation
+        success: Whether generation succeeded
+        error: Error message if generation failed
+        payload: Content dict returned to the caller
+    """
+    content_type: str
+    platform: str
+    topic: str
+    tone: Optional[str] = None
+    style: Optional[str] = None
+    generated_at: str = ""
+    success: bool = False
+    error: Optional[str] = None
+    payload: Any = None
+    
+    def to_dict(self) -> Dict:
+        """
+        Convert the record to the dict form returned by get_content_history.
+        
+        Returns:
+            Dict with type, platform, topic, generated_at and content keys
+        """
+        return {
+            "type": self.content_type,
+            "platform": self.platform,
+            "topic": self.topic,
+            "generated_at": self.generated_at,
+            "content": self.payload
+        }
+
+def _intern(value: Any) -> Any:
+    """
+    Intern a string so repeated keys like platform names compare by identity.
+    
+    Args:
+        value: Value to intern (non-strings are returned unchanged)
+        
+    Returns:
+        The interned string, or the original value
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _text_handler(handlers: Dict[type, Callable], text: Any) -> Optional[Callable]:
+    """
+    Pick the handler for the way content holds its text.
+    
+    Args:
+        handlers: Handlers for a text string (str) and a generated post dict (dict)
+        text: The content's "text" value
+        
+    Returns:
+        The matching handler, or None if the content has no text to handle
+    """
+    handler = handlers.get(type(text))
+    if handler is None:
+        # Subclasses of str/dict miss the exact-type lookup
+        if isinstance(text, str):
+            handler = handlers[str]
+        elif isinstance(text, dict):
+            handler = handlers[dict]
+    if handler is not None and handler is handlers[dict] and "text" not in text:
+        return None
+    return handler
+
 class ContentGenerator:
     """
     Content Generator for creating social media content.
@@ -25,6 +114,16 @@ class ContentGenerator:
     - Content scheduling
     """
     
+    __slots__ = (
+        "_text_llm", "_image_generator", "config",
+        "default_tone", "default_hashtags", "default_emojis",
+        "content_history", "_executor", "_text_optimizers", "_text_variers",
+        "_cache_results", "_cache_size", "_cache_ttl", "_result_cache", "_cache_lock",
+        # Provider methods and generation variants bound by the provider setters
+        "_gen_post", "_opt", "_vary", "_gen_image",
+        "generate_text_content", "generate_image_content"
+    )
+    
     def __init__(self, text_llm: BaseTextLLM = None, image_generator: BaseImageGenerator = None, config: Dict = None):
         """
         Initialize the Content Generator.
@@ -43,16 +142,72 @@ class ContentGenerator:
         self.default_hashtags = self.config.get("default_hashtags", 3)
         self.default_emojis = self.config.get("default_emojis", True)
         
-        # Content history for tracking generated content
-        self.content_history = []
+        # ContentResult history for tracking generated content (oldest first, bounded)
+        self.content_history = collections.deque(maxlen=self.config.get("history_max", 10000))
+        
+        # Worker threads for running provider calls side by side (created on first use)
+        self._executor = None
+        
+        # Opt-in cache of successful generations:
+        # (kind, *normalized arguments) -> (time.monotonic() timestamp, result), oldest first
+        self._cache_results = self.config.get("cache_results", False)
+        self._cache_size = self.config.get("cache_size", 256)
+        self._cache_ttl = self.config.get("cache_ttl", 600)
+        self._result_cache = collections.OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Text handlers keyed by the type of the content's "text" value
+        self._text_optimizers = {str: self._optimize_flat_text, dict: self._optimize_nested_text}
+        self._text_variers = {str: self._vary_flat_text, dict: self._vary_nested_text}
         
         logger.info("Content Generator initialized")
     
-    def generate_text_content(self, platform: str, topic: str, tone: str = None, 
-                             hashtags: int = None, emojis: bool = None) -> Dict:
+    @property
+    def text_llm(self) -> Optional[BaseTextLLM]:
+        """Text LLM provider."""
+        return self._text_llm
+    
+    @text_llm.setter
+    def text_llm(self, text_llm: Optional[BaseTextLLM]) -> None:
+        # Bind the provider methods once so generation calls skip the lookups
+        self._text_llm = text_llm
+        self._gen_post = text_llm.generate_social_media_post if text_llm else None
+        self._opt = text_llm.optimize_for_platform if text_llm else None
+        self._vary = text_llm.generate_content_variations if text_llm else None
+        # Without a provider, generation goes straight to the error result
+        self.generate_text_content = self._generate_text_real if text_llm else self._generate_text_disabled
+    
+    @property
+    def image_generator(self) -> Optional[BaseImageGenerator]:
+        """Image generation provider."""
+        return self._image_generator
+    
+    @image_generator.setter
+    def image_generator(self, image_generator: Optional[BaseImageGenerator]) -> None:
+        self._image_generator = image_generator
+        self._gen_image = image_generator.generate_social_media_image if image_generator else None
+        self.generate_image_content = (
+            self._generate_image_real if image_generator else self._generate_image_disabled
+        )
+    
+    def _generate_text_disabled(self, platform: str, topic: str, tone: str = None, 
+                               hashtags: int = None, emojis: bool = None) -> Dict:
+        """
+        generate_text_content when no text LLM provider is configured.
+        
+        Returns:
+            Dict containing the error
+        """
+        logger.error("No text LLM provider configured")
+        return {"success": False, "error": "No text LLM provider configured"}
+    
+    def _generate_text_real(self, platform: str, topic: str, tone: str = None, 
+                           hashtags: int = None, emojis: bool = None) -> Dict:
         """
         Generate text content for a specific platform.
         
+        Bound as generate_text_content while a text LLM provider is configured.
+        
         Args:
             platform: Target social media platform
             topic: Topic or subject of the content
@@ -63,18 +218,20 @@ class ContentGenerator:
         Returns:
             Dict containing the generated content
         """
-        if not self.text_llm:
-            logger.error("No text LLM provider configured")
-            return {"success": False, "error": "No text LLM provider configured"}
-        
         # Use default values if not specified
-        tone = tone or self.default_tone
+        platform = _intern(platform)
+        tone = _intern(tone or self.default_tone)
         hashtags = hashtags if hashtags is not None else self.default_hashtags
         emojis = emojis if emojis is not None else self.default_emojis
         
+        cache_key = ("text", platform, topic, tone, hashtags, emojis)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Generate content using the text LLM
-            content = self.text_llm.generate_social_media_post(
+            content = self._gen_post(
                 platform=platform,
                 topic=topic,
                 tone=tone,
@@ -86,27 +243,42 @@ class ContentGenerator:
             content["platform"] = platform
             content["topic"] = topic
             content["tone"] = tone
-            content["generated_at"] = datetime.datetime.now().isoformat()
+            content["generated_at"] = datetime.datetime.now(_UTC).isoformat()
             content["success"] = True
             
             # Add to history
-            self.content_history.append({
-                "type": "text",
-                "platform": platform,
-                "topic": topic,
-                "generated_at": content["generated_at"],
-                "content": content
-            })
+            self.content_history.append(ContentResult(
+                content_type="text",
+                platform=platform,
+                topic=topic,
+                tone=tone,
+                generated_at=content["generated_at"],
+                success=True,
+                payload=content
+            ))
             
+            self._cache_put(cache_key, content)
             return content
         except Exception as e:
-            logger.error(f"Error generating text content: {e}")
+            logger.error("Error generating text content: %s", e)
             return {"success": False, "error": str(e)}
     
-    def generate_image_content(self, platform: str, topic: str, style: str = "professional") -> Dict:
+    def _generate_image_disabled(self, platform: str, topic: str, style: str = "professional") -> Dict:
+        """
+        generate_image_content when no image generator is configured.
+        
+        Returns:
+            Dict containing the error
+        """
+        logger.error("No image generator configured")
+        return {"success": False, "error": "No image generator configured"}
+    
+    def _generate_image_real(self, platform: str, topic: str, style: str = "professional") -> Dict:
         """
         Generate image content for a specific platform.
         
+        Bound as generate_image_content while an image generator is configured.
+        
         Args:
             platform: Target social media platform
             topic: Topic or subject of the content
@@ -115,13 +287,16 @@ class ContentGenerator:
         Returns:
             Dict containing the generated content
         """
-        if not self.image_generator:
-            logger.error("No image generator configured")
-            return {"success": False, "error": "No image generator configured"}
+        platform, style = _intern(platform), _intern(style)
+        
+        cache_key = ("image", platform, topic, style)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             # Generate image using the image generator
-            image_result = self.image_generator.generate_social_media_image(
+            image_result = self._gen_image(
                 platform=platform,
                 topic=topic,
                 style=style
@@ -131,20 +306,25 @@ class ContentGenerator:
             image_result["platform"] = platform
             image_result["topic"] = topic
             image_result["style"] = style
-            image_result["generated_at"] = datetime.datetime.now().isoformat()
+            image_result["generated_at"] = datetime.datetime.now(_UTC).isoformat()
             
             # Add to history
-            self.content_history.append({
-                "type": "image",
-                "platform": platform,
-                "topic": topic,
-                "generated_at": image_result["generated_at"],
-                "content": image_result
-            })
+            self.content_history.append(ContentResult(
+                content_type="image",
+                platform=platform,
+                topic=topic,
+                style=style,
+                generated_at=image_result["generated_at"],
+                success=image_result.get("success", True),
+                error=image_result.get("error"),
+                payload=image_result
+            ))
             
+            if image_result.get("success", True):
+                self._cache_put(cache_key, image_result)
             return image_result
         except Exception as e:
-            logger.error(f"Error generating image content: {e}")
+            logger.error("Error generating image content: %s", e)
             return {"success": False, "error": str(e)}
     
     def generate_combined_content(self, platform: str, topic: str, tone: str = None, 
@@ -164,43 +344,118 @@ class ContentGenerator:
         Returns:
             Dict containing the generated content
         """
-        # Generate text content
-        text_content = self.generate_text_content(
+        platform = _intern(platform)
+        
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.config.get("max_workers", 4)
+            )
+        
+        # Generate the text and image content concurrently
+        text_future = self._executor.submit(
+            self.generate_text_content,
             platform=platform,
             topic=topic,
             tone=tone,
             hashtags=hashtags,
             emojis=emojis
         )
-        
-        # Generate image content
-        image_content = self.generate_image_content(
+        image_future = self._executor.submit(
+            self.generate_image_content,
             platform=platform,
             topic=topic,
             style=style
         )
+        text_content = text_future.result()
+        image_content = image_future.result()
         
         # Combine results
         combined_content = {
             "platform": platform,
             "topic": topic,
-            "generated_at": datetime.datetime.now().isoformat(),
+            "generated_at": datetime.datetime.now(_UTC).isoformat(),
             "text": text_content,
             "image": image_content,
             "success": text_content.get("success", False) and image_content.get("success", False)
         }
         
         # Add to history
-        self.content_history.append({
-            "type": "combined",
-            "platform": platform,
-            "topic": topic,
-            "generated_at": combined_content["generated_at"],
-            "content": combined_content
-        })
+        self.content_history.append(ContentResult(
+            content_type="combined",
+            platform=platform,
+            topic=topic,
+            tone=tone,
+            style=style,
+            generated_at=combined_content["generated_at"],
+            success=combined_content["success"],
+            payload=combined_content
+        ))
         
         return combined_content
     
+    def _cache_get(self, key: tuple) -> Optional[Dict]:
+        """
+        Look up a cached generation result.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            A copy of the cached result, or None if caching is off or there is no fresh entry
+        """
+        if not self._cache_results:
+            return None
+        
+        with self._cache_lock:
+            entry = self._result_cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self._cache_ttl:
+                del self._result_cache[key]
+                return None
+            self._result_cache.move_to_end(key)
+        
+        # Callers mutate results, so never hand out the cached object
+        return copy.deepcopy(entry[1])
+    
+    def _cache_put(self, key: tuple, result: Dict) -> None:
+        """
+        Cache a successful generation result.
+        
+        Args:
+            key: Cache key
+            result: Generated content
+        """
+        if not self._cache_results:
+            return
+        
+        result = copy.deepcopy(result)
+        with self._cache_lock:
+            self._result_cache[key] = (time.monotonic(), result)
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > self._cache_size:
+                self._result_cache.popitem(last=False)
+    
+    def clear_cache(self) -> None:
+        """
+        Clear the generation result cache.
+        """
+        with self._cache_lock:
+            self._result_cache.clear()
+    
+    def close(self) -> None:
+        """
+        Shut down the worker threads used for combined content generation.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def __del__(self):
+        # __init__ may have failed before the executor attribute was set
+        if getattr(self, "_executor", None) is not None:
+            self.close()
+    
     def optimize_content(self, content: Dict, target_platform: str) -> Dict:
         """
         Optimize content for a specific platform.
@@ -216,37 +471,34 @@ class ContentGenerator:
             logger.error("No text LLM provider configured")
             return {"success": False, "error": "No text LLM provider configured"}
         
+        target_platform = _intern(target_platform)
+        
         try:
-            optimized_content = content.copy()
+            # Optimize text content if present (before copying anything, so a
+            # failed provider call allocates nothing)
+            optimize_text = _text_handler(self._text_optimizers, content.get("text"))
+            if optimize_text:
+                optimized_text = optimize_text(content["text"], target_platform)
             
-            # Optimize text content if present
-            if "text" in content and isinstance(content["text"], str):
-                optimized_text = self.text_llm.optimize_for_platform(
-                    content=content["text"],
-                    platform=target_platform
-                )
+            optimized_content = {
+                **content,
+                "platform": target_platform,
+                "optimized": True,
+                "optimized_at": datetime.datetime.now(_UTC).isoformat(),
+                "success": True
+            }
+            if optimize_text:
                 optimized_content["text"] = optimized_text
-            elif "text" in content and isinstance(content["text"], dict) and "text" in content["text"]:
-                optimized_text = self.text_llm.optimize_for_platform(
-                    content=content["text"]["text"],
-                    platform=target_platform
-                )
-                optimized_content["text"]["text"] = optimized_text
             
             # Optimize image content if present and image generator is available
             if self.image_generator and "image" in content and isinstance(content["image"], dict) and "data" in content["image"]:
                 # For this to work, we'd need to download the image first
                 # This is a placeholder for the actual implementation
-                optimized_content["image"]["optimized"] = True
-            
-            optimized_content["platform"] = target_platform
-            optimized_content["optimized"] = True
-            optimized_content["optimized_at"] = datetime.datetime.now().isoformat()
-            optimized_content["success"] = True
+                optimized_content["image"] = {**content["image"], "optimized": True}
             
             return optimized_content
         except Exception as e:
-            logger.error(f"Error optimizing content: {e}")
+            logger.error("Error optimizing content: %s", e)
             return {"success": False, "error": str(e)}
     
     def generate_content_variations(self, content: Dict, variations: int = 3) -> List[Dict]:
@@ -265,45 +517,43 @@ class ContentGenerator:
             return [{"success": False, "error": "No text LLM provider configured"}]
         
         try:
-            content_variations = []
+            now_iso = datetime.datetime.now(_UTC).isoformat()
             
             # Generate text variations if text content is present
-            if "text" in content and isinstance(content["text"], str):
-                text_variations = self.text_llm.generate_content_variations(
-                    content=content["text"],
-                    variations=variations
-                )
-                
-                # Create a variation for each text
-                for i, text_var in enumerate(text_variations):
-                    variation = content.copy()
-                    variation["text"] = text_var
-                    variation["variation_number"] = i + 1
-                    variation["generated_at"] = datetime.datetime.now().isoformat()
-                    content_variations.append(variation)
-            elif "text" in content and isinstance(content["text"], dict) and "text" in content["text"]:
-                text_variations = self.text_llm.generate_content_variations(
-                    content=content["text"]["text"],
-                    variations=variations
-                )
-                
-                # Create a variation for each text
-                for i, text_var in enumerate(text_variations):
-                    variation = content.copy()
-                    variation["text"] = variation["text"].copy()
-                    variation["text"]["text"] = text_var
-                    variation["variation_number"] = i + 1
-                    variation["generated_at"] = datetime.datetime.now().isoformat()
-                    content_variations.append(variation)
+            vary_text = _text_handler(self._text_variers, content.get("text"))
+            if vary_text:
+                content_variations = [
+                    {**content, "text": text_var, "variation_number": i + 1, "generated_at": now_iso}
+                    for i, text_var in enumerate(vary_text(content["text"], variations))
+                ]
             else:
                 logger.warning("No text content found to generate variations")
                 return [{"success": False, "error": "No text content found to generate variations"}]
             
             return content_variations
         except Exception as e:
-            logger.error(f"Error generating content variations: {e}")
+            logger.error("Error generating content variations: %s", e)
             return [{"success": False, "error": str(e)}]
     
+    def _optimize_flat_text(self, text: str, platform: str) -> str:
+        """Optimize plain text content for a platform."""
+        return self._opt(content=text, platform=platform)
+    
+    def _optimize_nested_text(self, text: Dict, platform: str) -> Dict:
+        """Optimize the text of a generated post for a platform."""
+        return {**text, "text": self._opt(content=text["text"], platform=platform)}
+    
+    def _vary_flat_text(self, text: str, variations: int) -> List[str]:
+        """Generate variations of plain text content."""
+        return self._vary(content=text, variations=variations)
+    
+    def _vary_nested_text(self, text: Dict, variations: int) -> List[Dict]:
+        """Generate variations of the text of a generated post."""
+        return [
+            {**text, "text": text_var}
+            for text_var in self._vary(content=text["text"], variations=variations)
+        ]
+    
     def get_content_history(self, platform: str = None, content_type: str = None, 
                           limit: int = 10) -> List[Dict]:
         """
@@ -317,18 +567,17 @@ class ContentGenerator:
         Returns:
             List of content history items
         """
-        filtered_history = self.content_history
+        # History entries hold interned platform/type strings, so interning the
+        # filters lets most comparisons succeed on identity
+        platform, content_type = _intern(platform), _intern(content_type)
         
-        # Filter by platform
+        # History is appended in generation order, so walk it newest first,
+        # adding a filter stage only for the filters actually given
+        filtered_history = reversed(self.content_history)
         if platform:
-            filtered_history = [item for item in filtered_history if item["platform"] == platform]
-        
-        # Filter by content type
+            filtered_history = (item for item in filtered_history if item.platform == platform)
         if content_type:
-            filtered_history = [item for item in filtered_history if item["type"] == content_type]
-        
-        # Sort by generation time (newest first)
-        filtered_history.sort(key=lambda x: x["generated_at"], reverse=True)
+            filtered_history = (item for item in filtered_history if item.content_type == content_type)
         
         # Limit the number of items
-        return filtered_history[:limit]
+        return [item.to_dict() for item in itertools.islice(filtered_history, limit)]
@@ -7,14 +7,303 @@ for different social media platforms.
 
 import logging
 import datetime
-from typing import Dict, List, Optional, Any
+import functools
+import asyncio
+import collections
+import concurrent.futures
+import contextvars
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .content_generator import ContentGenerator
-from ..llm_integration.base_text_llm import BaseTextLLM
+from ..llm_integration.base_provider import BaseProvider, TokenBucket, new_http_session
+from ..llm_integration.base_text_llm import BaseTextLLM, StreamError
 from ..llm_integration.base_image_generator import BaseImageGenerator
 
 logger = logging.getLogger("content_generation.content_optimizer")
 
+# Prompt templates. Each starts with its fixed instructions, then the
+# per-platform guidelines, and ends with the content, so that requests share
+# as long a prefix as possible for provider-side prompt caching. {guidelines}
+# takes the lines rendered by _render_guidelines. The optimization and
+# improvement prompts are split into a per-platform prefix, rendered once in
+# PlatformCfg, and a per-request suffix.
+_OPTIMIZE_PREFIX = (
+    "Optimize a social media post for another platform.\n"
+    "Return only the optimized content without any explanations or additional text.\n"
+    "\n"
+    "Target platform: {target_platform}\n"
+    "Target platform guidelines:\n"
+    "{guidelines}"
+    "\n"
+)
+
+_OPTIMIZE_SUFFIX = "Original {source_platform} post: \"{text}\"\n"
+
+_IMPROVEMENT_PREFIX = (
+    "Analyze social media content and provide specific suggestions for improvement.\n"
+    "Format the response as JSON with these fields:\n"
+    "- overall_score: 1-10 rating of the content\n"
+    "- strengths: array of content strengths\n"
+    "- weaknesses: array of content weaknesses\n"
+    "- suggestions: array of specific improvement suggestions\n"
+    "- improved_version: an improved version of the content\n"
+    "\n"
+    "Platform: {platform}\n"
+    "Platform guidelines:\n"
+    "{guidelines}"
+    "\n"
+)
+
+_IMPROVEMENT_SUFFIX = "Content: \"{content}\"\n"
+
+_RECOMMENDATION_PROMPT = (
+    "Analyze social media content and recommend which platforms it would perform best on.\n"
+    "Rate each platform (Facebook, Twitter, Instagram, TikTok) on a scale of 1-10 for this content.\n"
+    "Format the response as JSON with platform names as keys and scores as values.\n"
+    "Include a brief explanation for each platform's score.\n"
+    "\n"
+    "Content: \"{content}\"\n"
+)
+
+_BATCH_RECOMMENDATION_PROMPT = (
+    "Analyze social media posts and recommend which platforms each would perform best on.\n"
+    "Rate each platform (Facebook, Twitter, Instagram, TikTok) on a scale of 1-10 for each post.\n"
+    "Format the response as a JSON array with one object per post, in the same order.\n"
+    "Each object should have platform names as keys and scores as values.\n"
+    "Include a brief explanation for each platform's score.\n"
+    "\n"
+    "Posts ({count}):\n"
+    "{items}\n"
+)
+
+_FENCE = "```"
+
+def _json_body(response: str) -> str:
+    """
+    Get the JSON text of a model response, unwrapping a Markdown code fence if present.
+    
+    Args:
+        response: Raw model response
+        
+    Returns:
+        str: The JSON text
+    """
+    # Locate the first ```json (or bare ```) fence and its closing fence with
+    # two str.find scans and slice once
+    start = response.find(_FENCE)
+    if start >= 0:
+        start += 3
+        if response.startswith("json", start):
+            start += 4
+        end = response.find(_FENCE, start)
+        if end >= 0:
+            return response[start:end].strip()
+    return response.strip()
+
+def _extract_json(response: str) -> Any:
+    """
+    Parse the JSON in a model response, unwrapping a Markdown code fence if present.
+    
+    Args:
+        response: Raw model response
+        
+    Returns:
+        The parsed JSON value
+    """
+    json_str = _json_body(response)
+    return orjson.loads(json_str) if orjson is not None else json.loads(json_str)
+
+class ImprovementSuggestions(BaseModel):
+    """
+    Schema of the JSON response requested by _IMPROVEMENT_PREFIX.
+    """
+    
+    overall_score: Union[int, float]
+    strengths: List[str]
+    weaknesses: List[str]
+    suggestions: List[str]
+    improved_version: str
+
+def _render_guidelines(settings: Dict, with_max: bool) -> str:
+    """
+    Render a platform's guideline lines for a prompt.
+    
+    Args:
+        settings: Platform settings (empty for unknown platforms)
+        with_max: Whether to include the maximum text length
+        
+    Returns:
+        str: Guideline lines, each ending in a newline
+    """
+    text_length = settings.get('text_length', {})
+    length = f"optimal {text_length.get('optimal', 'appropriate')} characters"
+    if with_max:
+        length += f", max {text_length.get('max', 'platform limit')}"
+    emojis = "include appropriate emojis" if settings.get('emojis', True) else "minimize emoji use"
+    return (
+        f"- Text length: {length}\n"
+        f"- Hashtags: optimal {settings.get('hashtags', {}).get('optimal', 'appropriate')} hashtags\n"
+        f"- Tone: {settings.get('tone', 'appropriate for platform')}\n"
+        f"- Emojis: {emojis}\n"
+    )
+
+# Quotation marks models like to wrap optimized text in
+_QUOTES = "\"'"
+
+def _unquote(text: str) -> str:
+    """
+    Remove quotation marks wrapped around model output.
+    
+    Args:
+        text: Model output
+        
+    Returns:
+        str: The text without leading/trailing quotes (the same object if there are none)
+    """
+    if text and (text[0] in _QUOTES or text[-1] in _QUOTES):
+        return text.strip(_QUOTES)
+    return text
+
+def _truncate(text: str, max_chars: int) -> str:
+    """
+    Shorten text to at most max_chars characters without splitting a word.
+    
+    The text is cut at the last whitespace or hashtag start that fits, so
+    words, hashtags, URLs and emoji sequences are kept whole; a single token
+    longer than max_chars is cut at max_chars.
+    
+    Args:
+        text: Text to shorten
+        max_chars: Character limit
+        
+    Returns:
+        str: The text, or its longest prefix ending on a token boundary
+    """
+    if len(text) <= max_chars:
+        return text
+    cut = max_chars
+    while cut > 0 and not (text[cut].isspace() or text[cut] == "#"):
+        cut -= 1
+    return text[:cut or max_chars].rstrip()
+
+# Timestamp shared by every result of one combined optimization (see _now_iso)
+_request_ts = contextvars.ContextVar("content_optimizer_request_ts", default=None)
+
+def _now_iso() -> str:
+    """
+    Current time as an ISO 8601 string, or the timestamp of the combined
+    optimization in progress so its text, image and combined results agree.
+    
+    Returns:
+        str: ISO 8601 timestamp (UTC)
+    """
+    ts = _request_ts.get()
+    return ts if ts is not None else datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+# Per-platform settings flattened for the hot path; the prefix fields hold the
+# platform's rendered _OPTIMIZE_PREFIX and _IMPROVEMENT_PREFIX (None when the
+# platform name is not known in advance)
+PlatformCfg = collections.namedtuple(
+    "PlatformCfg",
+    "tone emojis image_ratio len_min len_optimal len_max tag_min tag_optimal tag_max "
+    "optimize_prefix improvement_prefix"
+)
+
+def _platform_cfg(settings: Dict, platform: Optional[str] = None) -> PlatformCfg:
+    """
+    Build the flattened configuration for a platform's settings.
+    
+    Args:
+        settings: Platform settings (empty for unknown platforms)
+        platform: Platform name used in the prompt prefixes (None to skip them)
+        
+    Returns:
+        PlatformCfg for the platform
+    """
+    text_length = settings.get("text_length") or {}
+    hashtags = settings.get("hashtags") or {}
+    return PlatformCfg(
+        tone=settings.get("tone"),
+        emojis=settings.get("emojis", True),
+        image_ratio=settings.get("image_ratio"),
+        len_min=text_length.get("min"),
+        len_optimal=text_length.get("optimal"),
+        len_max=text_length.get("max"),
+        tag_min=hashtags.get("min"),
+        tag_optimal=hashtags.get("optimal"),
+        tag_max=hashtags.get("max"),
+        optimize_prefix=None if platform is None else _OPTIMIZE_PREFIX.format(
+            target_platform=platform,
+            guidelines=_render_guidelines(settings, with_max=True)
+        ),
+        improvement_prefix=None if platform is None else _IMPROVEMENT_PREFIX.format(
+            platform=platform,
+            guidelines=_render_guidelines(settings, with_max=False)
+        )
+    )
+
+_DEFAULT_CFG = _platform_cfg({})
+
+_HASHTAG_RE = re.compile(r"#\w+")
+
+def _fits_platform(text: str, cfg: PlatformCfg) -> bool:
+    """
+    Check whether text already meets a platform's length and hashtag limits.
+    
+    Args:
+        text: Text content
+        cfg: Target platform configuration
+        
+    Returns:
+        bool: Whether the text is within the limits (False for unknown platforms)
+    """
+    if cfg.len_max is None or len(text) > cfg.len_max:
+        return False
+    hashtags = len(_HASHTAG_RE.findall(text))
+    return (cfg.tag_min or 0) <= hashtags <= (cfg.tag_max if cfg.tag_max is not None else hashtags)
+
+def _split_str_text(value: str) -> Tuple[str, Callable[[str], Any]]:
+    """
+    Split plain-string combined content text into the text and a rewrapper.
+    
+    Args:
+        value: Content text
+        
+    Returns:
+        Tuple of the text to optimize and a function building the optimized value
+    """
+    return value, str
+
+def _split_dict_text(value: Dict) -> Tuple[Optional[str], Callable[[str], Any]]:
+    """
+    Split a text content dict (with a "text" field) into the text and a rewrapper.
+    
+    Args:
+        value: Text content dict
+        
+    Returns:
+        Tuple of the text to optimize (None if absent) and a function building
+        a copy of the dict holding the optimized text
+    """
+    return value.get("text"), lambda optimized: {**value, "text": optimized}
+
+# Handlers for the type of a combined content's "text" value
+_TEXT_HANDLERS = {str: _split_str_text, dict: _split_dict_text}
+
 class ContentOptimizer:
     """
     Content Optimizer for optimizing content for different social media platforms.
@@ -38,6 +327,20 @@ class ContentOptimizer:
         self.image_generator = image_generator
         self.config = config or {}
         
+        # One pooled HTTP session for both providers, unless they already have one
+        self.http_session = None
+        for provider in (text_llm, image_generator):
+            if isinstance(provider, BaseProvider) and provider.session is None:
+                if self.http_session is None:
+                    self.http_session = new_http_session()
+                provider.set_session(self.http_session)
+        
+        # Flattened settings and prompt prefixes per lower-cased platform name,
+        # with lookups by platform name as given memoized per instance; both
+        # are rebuilt whenever the platform settings change
+        self._cfg = {}
+        self._get_cfg = functools.lru_cache(maxsize=32)(self._lookup_cfg)
+        
         # Platform-specific settings
         self.platform_settings = {
             "facebook": {
@@ -70,11 +373,365 @@ class ContentOptimizer:
             }
         }
         
-        # Optimization history
-        self.optimization_history = []
+        # Optimization history: bounded summaries of each optimization and its result
+        self.optimization_history = collections.deque(maxlen=self.config.get("history_max", 1000))
+        
+        # Sampling temperatures; deterministic by default so that identical
+        # requests get identical answers and the response cache can serve them
+        self.optimize_temperature = self.config.get("optimize_temperature", 0.0)
+        self.recommendation_temperature = self.config.get("recommendation_temperature", 0.0)
+        
+        # Cache of LLM responses keyed by a hash of the model, sampling
+        # parameters and rendered prompt -> (time.monotonic() timestamp, text)
+        self._llm_cache = collections.OrderedDict()
+        self._llm_cache_size = self.config.get("llm_cache_size", 1024)
+        self._llm_cache_ttl = self.config.get("llm_cache_ttl", 3600)
+        self._llm_cache_lock = threading.Lock()
+        
+        # Opt-in semantic cache of text optimizations: a FAISS inner-product
+        # index over normalized embeddings of (source, target, text), with the
+        # optimization payload for each vector (loaded on first use). New
+        # entries are saved in batches of semantic_cache_flush_every and on close().
+        self._sem_enabled = self.config.get("semantic_cache", False)
+        self._sem_threshold = self.config.get("semantic_cache_threshold", 0.92)
+        self._sem_path = self.config.get("semantic_cache_path")
+        self._sem_flush_every = self.config.get("semantic_cache_flush_every", 100)
+        self._sem_encoder = None
+        self._sem_index = None
+        self._sem_payloads = []
+        self._sem_unsaved = 0
+        self._sem_lock = threading.Lock()
+        self._sem_init_lock = threading.Lock()
+        self._sem_save_lock = threading.Lock()
+        
+        # Worker threads for running the image half of combined optimizations
+        # next to the text half (created on first use)
+        self._executor = None
+        self._executor_lock = threading.Lock()
         
         logger.info("Content Optimizer initialized")
     
+    def _llm_cache_key(self, prompt: str, max_tokens: int, temperature: float, max_chars: Optional[int] = None) -> str:
+        """
+        Build the LLM response cache key for a request.
+        
+        Args:
+            prompt: Fully rendered prompt
+            max_tokens: Maximum number of tokens to generate
+            temperature: Controls randomness (0.0 to 1.0)
+            max_chars: Character limit the response is trimmed to, if any
+            
+        Returns:
+            str: SHA-256 hex digest of the model, sampling parameters and prompt
+        """
+        model_id = getattr(self.text_llm, "model", None) or getattr(self.text_llm, "provider_name", "")
+        limit = "" if max_chars is None else f"|{max_chars}"
+        return hashlib.sha256(f"{model_id}|{temperature}|{max_tokens}{limit}|{prompt}".encode()).hexdigest()
+    
+    @property
+    def platform_settings(self) -> Dict[str, Dict]:
+        """
+        Platform-specific settings, keyed by platform name.
+        
+        Assigning a new dict rebuilds the derived per-platform configuration.
+        Settings edited in place take effect after update_platform_settings().
+        """
+        return self._platform_settings
+    
+    @platform_settings.setter
+    def platform_settings(self, settings: Dict[str, Dict]) -> None:
+        self._platform_settings = settings
+        self._rebuild_cfg()
+    
+    def update_platform_settings(self, platform: Optional[str] = None, settings: Optional[Dict] = None) -> None:
+        """
+        Update the settings of a platform and rebuild the derived configuration.
+        
+        Args:
+            platform: Platform to update; None only rebuilds, e.g. after in-place edits
+            settings: Settings to merge into the platform's current settings
+        """
+        if platform is not None:
+            self._platform_settings.setdefault(platform.lower(), {}).update(settings or {})
+        self._rebuild_cfg()
+    
+    def _rebuild_cfg(self) -> None:
+        """
+        Rebuild the flattened per-platform configuration from platform_settings.
+        """
+        self._cfg = {
+            sys.intern(platform.lower()): _platform_cfg(settings, platform.lower())
+            for platform, settings in self._platform_settings.items()
+        }
+        self._get_cfg.cache_clear()
+    
+    def _lookup_cfg(self, platform: str) -> PlatformCfg:
+        """
+        Get the flattened configuration for a platform.
+        
+        Called through self._get_cfg, which memoizes it by platform name.
+        
+        Args:
+            platform: Platform name (any case)
+            
+        Returns:
+            PlatformCfg for the platform, or defaults for unknown platforms
+        """
+        return self._cfg.get(platform.lower(), _DEFAULT_CFG)
+    
+    def _optimize_prompt(self, text: str, source_platform: str, target_platform: str) -> str:
+        """
+        Render the prompt for optimizing text for a platform.
+        
+        Args:
+            text: Original text content
+            source_platform: Original platform
+            target_platform: Target platform
+            
+        Returns:
+            str: Rendered prompt
+        """
+        prefix = self._get_cfg(target_platform).optimize_prefix
+        if prefix is None:
+            prefix = _OPTIMIZE_PREFIX.format(
+                target_platform=target_platform,
+                guidelines=_render_guidelines({}, with_max=True)
+            )
+        return prefix + _OPTIMIZE_SUFFIX.format(source_platform=source_platform, text=text)
+    
+    def _generate_bounded(self, prompt: str, max_tokens: int, temperature: float, max_chars: int) -> str:
+        """
+        Generate text of at most max_chars characters.
+        
+        With a streaming provider, generation is abandoned once the output runs
+        20% past the limit, rather than waiting for max_tokens. A failed stream
+        is reported as "Error: ..." text, like generate_text failures, and any
+        partial output is discarded.
+        
+        Args:
+            prompt: Fully rendered prompt
+            max_tokens: Maximum number of tokens to generate
+            temperature: Controls randomness (0.0 to 1.0)
+            max_chars: Character limit for the response
+            
+        Returns:
+            str: Generated text, trimmed to max_chars at a word boundary
+        """
+        if not (isinstance(self.text_llm, BaseTextLLM) and self.text_llm.supports_streaming):
+            text = self.text_llm.generate_text(prompt, max_tokens=max_tokens, temperature=temperature)
+        else:
+            budget = int(max_chars * 1.2)
+            parts, length = [], 0
+            stream = self.text_llm.generate_text_stream(prompt, max_tokens=max_tokens, temperature=temperature)
+            try:
+                for chunk in stream:
+                    parts.append(chunk)
+                    length += len(chunk)
+                    if length > budget:
+                        break
+            except StreamError as e:
+                return f"Error: {e}"
+            finally:
+                stream.close()
+            text = "".join(parts)
+        
+        if text.startswith("Error:"):
+            return text
+        return _truncate(text, max_chars)
+    
+    def _cached_generate(self, prompt: str, max_tokens: int, temperature: float,
+                         max_chars: Optional[int] = None) -> Tuple[str, bool]:
+        """
+        Generate text with the text LLM, reusing the response to an identical earlier request.
+        
+        Args:
+            prompt: Fully rendered prompt
+            max_tokens: Maximum number of tokens to generate
+            temperature: Controls randomness (0.0 to 1.0)
+            max_chars: Character limit for the response (None for no limit)
+            
+        Returns:
+            Tuple of the generated text and whether it came from the cache
+        """
+        key = self._llm_cache_key(prompt, max_tokens, temperature, max_chars)
+        
+        with self._llm_cache_lock:
+            entry = self._llm_cache.get(key)
+            if entry is not None:
+                if time.monotonic() - entry[0] < self._llm_cache_ttl:
+                    self._llm_cache.move_to_end(key)
+                    return entry[1], True
+                del self._llm_cache[key]
+        
+        if max_chars is None:
+            text = self.text_llm.generate_text(prompt, max_tokens=max_tokens, temperature=temperature)
+        else:
+            text = self._generate_bounded(prompt, max_tokens, temperature, max_chars)
+        
+        # Providers report failures as "Error: ..." text; those are not worth keeping
+        if not text.startswith("Error:"):
+            with self._llm_cache_lock:
+                self._llm_cache[key] = (time.monotonic(), text)
+                self._llm_cache.move_to_end(key)
+                while len(self._llm_cache) > self._llm_cache_size:
+                    self._llm_cache.popitem(last=False)
+        
+        return text, False
+    
+    def _semantic_ready(self) -> bool:
+        """
+        Load the semantic cache encoder and index if the cache is enabled.
+        
+        Returns:
+            bool: Whether the semantic cache can be used
+        """
+        if not self._sem_enabled:
+            return False
+        if self._sem_index is not None:
+            return True
+        
+        with self._sem_init_lock:
+            # Another thread may have finished loading while this one waited
+            if not self._sem_enabled:
+                return False
+            if self._sem_index is not None:
+                return True
+            
+            try:
+                import faiss
+                from sentence_transformers import SentenceTransformer
+            except ImportError as e:
+                logger.warning("Semantic cache disabled, missing dependency: %s", e)
+                self._sem_enabled = False
+                return False
+            
+            # A failed model download or a corrupt cache file disables the
+            # semantic cache for this instance; optimizations fall back to the LLM
+            try:
+                encoder = SentenceTransformer(
+                    self.config.get("semantic_cache_model", "sentence-transformers/all-MiniLM-L6-v2")
+                )
+                payloads = []
+                if self._sem_path and os.path.exists(self._sem_path):
+                    with open(self._sem_path + ".json", 'r') as f:
+                        payloads = json.load(f)
+                    index = faiss.read_index(self._sem_path)
+                else:
+                    index = faiss.IndexFlatIP(encoder.get_sentence_embedding_dimension())
+            except Exception as e:
+                logger.error("Semantic cache disabled, error loading it: %s", e)
+                self._sem_enabled = False
+                return False
+            
+            self._sem_encoder = encoder
+            self._sem_payloads = payloads
+            # Set last: other threads take a non-None index as the sign that loading is done
+            self._sem_index = index
+        return True
+    
+    def _semantic_lookup(self, text: str, source_platform: str, target_platform: str) -> Tuple[Optional[str], Any]:
+        """
+        Find a cached optimization of near-identical text between the same platforms.
+        
+        Args:
+            text: Original text content
+            source_platform: Original platform (lower-cased)
+            target_platform: Target platform (lower-cased)
+            
+        Returns:
+            Tuple of the cached optimized text (None on a miss) and the query embedding
+        """
+        vector = self._sem_encoder.encode(
+            [f"{source_platform}|{target_platform}|{text}"],
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).astype("float32")
+        
+        with self._sem_lock:
+            if self._sem_index.ntotal == 0:
+                return None, vector
+            scores, ids = self._sem_index.search(vector, 1)
+            score, i = float(scores[0][0]), int(ids[0][0])
+            if i < 0 or i >= len(self._sem_payloads) or score < self._sem_threshold:
+                return None, vector
+            payload = self._sem_payloads[i]
+        
+        if payload["source_platform"] == source_platform and payload["target_platform"] == target_platform:
+            return payload["optimized_text"], vector
+        return None, vector
+    
+    def _semantic_store(self, vector: Any, source_platform: str, target_platform: str, optimized_text: str) -> None:
+        """
+        Add an optimization to the semantic cache.
+        
+        If a cache path is configured, the cache is saved once
+        semantic_cache_flush_every entries have been added since the last save.
+        
+        Args:
+            vector: Embedding returned by _semantic_lookup
+            source_platform: Original platform (lower-cased)
+            target_platform: Target platform (lower-cased)
+            optimized_text: Optimized text content
+        """
+        with self._sem_lock:
+            self._sem_index.add(vector)
+            self._sem_payloads.append({
+                "source_platform": source_platform,
+                "target_platform": target_platform,
+                "optimized_text": optimized_text
+            })
+            self._sem_unsaved += 1
+            flush = self._sem_unsaved >= self._sem_flush_every
+        
+        if flush:
+            self.flush_semantic_cache()
+    
+    def flush_semantic_cache(self) -> None:
+        """
+        Save semantic cache entries added since the last save, if a cache path is configured.
+        
+        The index is serialized under the cache lock, and written to disk
+        outside it, so lookups are not blocked by file I/O.
+        """
+        if not self._sem_path or self._sem_index is None:
+            return
+        
+        import faiss
+        
+        with self._sem_save_lock:
+            with self._sem_lock:
+                if not self._sem_unsaved:
+                    return
+                index_bytes = faiss.serialize_index(self._sem_index).tobytes()
+                payloads = list(self._sem_payloads)
+                unsaved, self._sem_unsaved = self._sem_unsaved, 0
+            
+            try:
+                # Write to temporary files and swap them in, so a crash never leaves a partial cache
+                with open(self._sem_path + ".tmp", 'wb') as f:
+                    f.write(index_bytes)
+                with open(self._sem_path + ".json.tmp", 'w') as f:
+                    json.dump(payloads, f)
+                os.replace(self._sem_path + ".tmp", self._sem_path)
+                os.replace(self._sem_path + ".json.tmp", self._sem_path + ".json")
+            except Exception as e:
+                logger.error("Error saving semantic cache: %s", e)
+                with self._sem_lock:
+                    self._sem_unsaved += unsaved
+    
+    def close(self) -> None:
+        """
+        Save the semantic cache, and shut down the worker threads and the
+        HTTP session this optimizer created.
+        """
+        self.flush_semantic_cache()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self.http_session is not None:
+            self.http_session.close()
+            self.http_session = None
+    
     def optimize_text_for_platform(self, text: str, source_platform: str, target_platform: str) -> Dict:
         """
         Optimize text content for a specific platform.
@@ -91,38 +748,46 @@ class ContentOptimizer:
             logger.error("No text LLM provider configured")
             return {"success": False, "error": "No text LLM provider configured"}
         
-        # Get platform-specific settings
-        source_settings = self.platform_settings.get(source_platform.lower(), {})
-        target_settings = self.platform_settings.get(target_platform.lower(), {})
-        
         try:
             # Create an optimization prompt
-            prompt = f"""
-            Optimize this {source_platform} post for {target_platform}:
-            
-            Original content: "{text}"
+            prompt = self._optimize_prompt(text, source_platform, target_platform)
+            platforms = (source_platform.lower(), target_platform.lower())
             
-            Target platform guidelines:
-            - Text length: optimal {target_settings.get('text_length', {}).get('optimal', 'appropriate')} characters, max {target_settings.get('text_length', {}).get('max', 'platform limit')}
-            - Hashtags: optimal {target_settings.get('hashtags', {}).get('optimal', 'appropriate')} hashtags
-            - Tone: {target_settings.get('tone', 'appropriate for platform')}
-            - Emojis: {"include appropriate emojis" if target_settings.get('emojis', True) else "minimize emoji use"}
+            # Text already written for and within the limits of the target
+            # platform needs no optimization
+            cfg = self._get_cfg(platforms[1])
+            skipped = platforms[0] == platforms[1] and _fits_platform(text, cfg)
             
-            Return only the optimized content without any explanations or additional text.
-            """
-            
-            # Generate optimized content
-            optimized_text = self.text_llm.generate_text(prompt, max_tokens=500, temperature=0.4)
-            
-            # Remove any quotation marks that might be included
-            optimized_text = optimized_text.strip('"\'')
+            # Otherwise reuse an optimization of near-identical text, or generate one
+            cache_hit_type = None
+            optimized_text, vector = None, None
+            if skipped:
+                optimized_text = text
+                cache_hit_type = "preflight"
+            elif self._semantic_ready():
+                optimized_text, vector = self._semantic_lookup(text, *platforms)
+                if optimized_text is not None:
+                    cache_hit_type = "semantic"
+            if optimized_text is None:
+                optimized_text, exact_hit = self._cached_generate(
+                    prompt, max_tokens=500, temperature=self.optimize_temperature, max_chars=cfg.len_max
+                )
+                cache_hit_type = "exact" if exact_hit else None
+                
+                # Remove any quotation marks that might be included
+                optimized_text = _unquote(optimized_text)
+                if vector is not None and not optimized_text.startswith("Error:"):
+                    self._semantic_store(vector, *platforms, optimized_text)
             
             result = {
                 "original_text": text,
                 "optimized_text": optimized_text,
                 "source_platform": source_platform,
                 "target_platform": target_platform,
-                "optimized_at": datetime.datetime.now().isoformat(),
+                "optimized_at": _now_iso(),
+                "cache_hit": cache_hit_type is not None,
+                "cache_hit_type": cache_hit_type,
+                "skipped": skipped,
                 "success": True
             }
             
@@ -132,7 +797,9 @@ class ContentOptimizer:
                 "source_platform": source_platform,
                 "target_platform": target_platform,
                 "optimized_at": result["optimized_at"],
-                "content": result
+                "optimized_text": optimized_text,
+                "sizes": {"original": len(text), "optimized": len(optimized_text)},
+                "cache_hit_type": cache_hit_type
             })
             
             return result
@@ -166,7 +833,7 @@ class ContentOptimizer:
             # Add metadata
             result["source_platform"] = source_platform
             result["target_platform"] = target_platform
-            result["optimized_at"] = datetime.datetime.now().isoformat()
+            result["optimized_at"] = _now_iso()
             
             # Add to history
             self.optimization_history.append({
@@ -174,7 +841,9 @@ class ContentOptimizer:
                 "source_platform": source_platform,
                 "target_platform": target_platform,
                 "optimized_at": result["optimized_at"],
-                "content": result
+                "image_path": image_path,
+                "local_path": result.get("local_path"),
+                "success": result.get("success", True)
             })
             
             return result
@@ -182,14 +851,50 @@ class ContentOptimizer:
             logger.error(f"Error optimizing image content: {e}")
             return {"success": False, "error": str(e)}
     
-    def optimize_combined_content(self, content: Dict, source_platform: str, target_platform: str) -> Dict:
+    def _combined_parts(self, content: Dict) -> Tuple[Optional[str], Optional[Callable[[str], Any]], Optional[str]]:
         """
-        Optimize combined text and image content for a specific platform.
+        Find the text and image that optimize_combined_content should optimize.
         
         Args:
             content: Original content dictionary with text and image
+            
+        Returns:
+            Tuple of the text to optimize, the function that rewraps the optimized
+            text like the original, and the image path (each None if absent)
+        """
+        text, wrap = None, None
+        value = content.get("text")
+        handler = _TEXT_HANDLERS.get(type(value))
+        if handler is None:
+            # Subclasses of str/dict miss the exact-type lookup
+            if isinstance(value, str):
+                handler = _split_str_text
+            elif isinstance(value, dict):
+                handler = _split_dict_text
+        if handler is not None:
+            text, wrap = handler(value)
+        
+        image_path = None
+        if "image" in content and isinstance(content["image"], dict) and "local_path" in content["image"]:
+            image_path = content["image"]["local_path"]
+        elif "image_path" in content:
+            image_path = content["image_path"]
+        
+        return text, wrap, image_path
+    
+    def _combine_results(self, text: Optional[str], wrap: Optional[Callable[[str], Any]],
+                         source_platform: str, target_platform: str,
+                         text_result: Optional[Dict], image_result: Optional[Dict]) -> Dict:
+        """
+        Assemble and record the result of a combined optimization.
+        
+        Args:
+            text: Original text returned by _combined_parts
+            wrap: Text rewrapper returned by _combined_parts
             source_platform: Original platform
             target_platform: Target platform
+            text_result: Result of the text optimization, if any
+            image_result: Result of the image optimization, if any
             
         Returns:
             Dict containing the optimized content
@@ -197,57 +902,197 @@ class ContentOptimizer:
         result = {
             "source_platform": source_platform,
             "target_platform": target_platform,
-            "optimized_at": datetime.datetime.now().isoformat(),
+            "optimized_at": _now_iso(),
             "success": True
         }
         
-        # Optimize text if present
-        if "text" in content:
-            if isinstance(content["text"], str):
-                text_result = self.optimize_text_for_platform(
-                    text=content["text"],
-                    source_platform=source_platform,
-                    target_platform=target_platform
-                )
-                result["text"] = text_result.get("optimized_text", content["text"])
-                result["text_optimization"] = text_result
-            elif isinstance(content["text"], dict) and "text" in content["text"]:
-                text_result = self.optimize_text_for_platform(
-                    text=content["text"]["text"],
-                    source_platform=source_platform,
-                    target_platform=target_platform
-                )
-                result["text"] = content["text"].copy()
-                result["text"]["text"] = text_result.get("optimized_text", content["text"]["text"])
-                result["text_optimization"] = text_result
+        if text_result is not None:
+            result["text"] = wrap(text_result.get("optimized_text", text))
+            result["text_optimization"] = text_result
         
-        # Optimize image if present
-        if "image" in content and isinstance(content["image"], dict) and "local_path" in content["image"]:
-            image_result = self.optimize_image_for_platform(
-                image_path=content["image"]["local_path"],
-                source_platform=source_platform,
-                target_platform=target_platform
-            )
-            result["image"] = image_result
-        elif "image_path" in content:
-            image_result = self.optimize_image_for_platform(
-                image_path=content["image_path"],
-                source_platform=source_platform,
-                target_platform=target_platform
-            )
+        if image_result is not None:
             result["image"] = image_result
         
         # Add to history
-        self.optimization_history.append({
+        entry = {
             "type": "combined_optimization",
             "source_platform": source_platform,
             "target_platform": target_platform,
             "optimized_at": result["optimized_at"],
-            "content": result
-        })
+            "optimized_text": None,
+            "local_path": image_result.get("local_path") if image_result else None
+        }
+        if text_result is not None and "optimized_text" in text_result:
+            original = text_result["original_text"]
+            entry["optimized_text"] = text_result["optimized_text"]
+            entry["sizes"] = {"original": len(original), "optimized": len(text_result["optimized_text"])}
+        self.optimization_history.append(entry)
         
         return result
     
+    def optimize_combined_content(self, content: Dict, source_platform: str, target_platform: str) -> Dict:
+        """
+        Optimize combined text and image content for a specific platform.
+        
+        When there is both text and an image, the image is optimized on a
+        shared worker thread (max_workers config, default 4) while the text is
+        optimized on the calling thread. Code running an event loop can use
+        aoptimize_combined_content instead.
+        
+        Args:
+            content: Original content dictionary with text and image
+            source_platform: Original platform
+            target_platform: Target platform
+            
+        Returns:
+            Dict containing the optimized content
+        """
+        text, wrap, image_path = self._combined_parts(content)
+        if text is None or image_path is None:
+            return self._optimize_combined_serial(content, source_platform, target_platform)
+        
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.config.get("max_workers", 4)
+                    )
+        
+        token = _request_ts.set(_now_iso())
+        try:
+            # The worker runs in a copy of this context, so both halves share the timestamp
+            image_future = self._executor.submit(
+                contextvars.copy_context().run,
+                self.optimize_image_for_platform,
+                image_path=image_path,
+                source_platform=source_platform,
+                target_platform=target_platform
+            )
+            text_result = self.optimize_text_for_platform(
+                text=text,
+                source_platform=source_platform,
+                target_platform=target_platform
+            )
+            image_result = image_future.result()
+            return self._combine_results(text, wrap, source_platform, target_platform, text_result, image_result)
+        finally:
+            _request_ts.reset(token)
+    
+    def _optimize_combined_serial(self, content: Dict, source_platform: str, target_platform: str) -> Dict:
+        """
+        Optimize combined text and image content, one after the other.
+        
+        Args:
+            content: Original content dictionary with text and image
+            source_platform: Original platform
+            target_platform: Target platform
+            
+        Returns:
+            Dict containing the optimized content
+        """
+        token = _request_ts.set(_now_iso())
+        try:
+            text, wrap, image_path = self._combined_parts(content)
+            text_result = None
+            if text is not None:
+                text_result = self.optimize_text_for_platform(
+                    text=text,
+                    source_platform=source_platform,
+                    target_platform=target_platform
+                )
+            image_result = None
+            if image_path is not None:
+                image_result = self.optimize_image_for_platform(
+                    image_path=image_path,
+                    source_platform=source_platform,
+                    target_platform=target_platform
+                )
+            return self._combine_results(text, wrap, source_platform, target_platform, text_result, image_result)
+        finally:
+            _request_ts.reset(token)
+    
+    def optimize_combined_content_bulk(self, items: List[Dict], source_platform: str, target_platform: str) -> List[Dict]:
+        """
+        Optimize many pieces of combined content for a specific platform.
+        
+        Items are optimized on bulk_workers threads (config, default 8). If
+        bulk_qps is configured, items are started at no more than that rate.
+        
+        Args:
+            items: Original content dictionaries with text and image
+            source_platform: Original platform
+            target_platform: Target platform
+            
+        Returns:
+            List of optimized content dicts, in the order of items
+        """
+        qps = self.config.get("bulk_qps")
+        limiter = TokenBucket(qps) if qps else None
+        
+        def optimize(content: Dict) -> Dict:
+            if limiter is not None:
+                limiter.acquire()
+            return self._optimize_combined_serial(content, source_platform, target_platform)
+        
+        workers = max(1, min(self.config.get("bulk_workers", 8), len(items)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(optimize, items))
+    
+    async def aoptimize_text_for_platform(self, text: str, source_platform: str, target_platform: str) -> Dict:
+        """
+        Optimize text content for a specific platform without blocking the event loop.
+        
+        Args:
+            text: Original text content
+            source_platform: Original platform
+            target_platform: Target platform
+            
+        Returns:
+            Dict containing the optimized text
+        """
+        return await asyncio.to_thread(self.optimize_text_for_platform, text, source_platform, target_platform)
+    
+    async def aoptimize_image_for_platform(self, image_path: str, source_platform: str, target_platform: str) -> Dict:
+        """
+        Optimize image content for a specific platform without blocking the event loop.
+        
+        Args:
+            image_path: Path to the original image
+            source_platform: Original platform
+            target_platform: Target platform
+            
+        Returns:
+            Dict containing the optimized image data
+        """
+        return await asyncio.to_thread(self.optimize_image_for_platform, image_path, source_platform, target_platform)
+    
+    async def aoptimize_combined_content(self, content: Dict, source_platform: str, target_platform: str) -> Dict:
+        """
+        Optimize combined text and image content, running both optimizations concurrently.
+        
+        Args:
+            content: Original content dictionary with text and image
+            source_platform: Original platform
+            target_platform: Target platform
+            
+        Returns:
+            Dict containing the optimized content
+        """
+        text, wrap, image_path = self._combined_parts(content)
+        
+        async def _none() -> None:
+            return None
+        
+        token = _request_ts.set(_now_iso())
+        try:
+            text_result, image_result = await asyncio.gather(
+                self.aoptimize_text_for_platform(text, source_platform, target_platform) if text is not None else _none(),
+                self.aoptimize_image_for_platform(image_path, source_platform, target_platform) if image_path is not None else _none()
+            )
+            return self._combine_results(text, wrap, source_platform, target_platform, text_result, image_result)
+        finally:
+            _request_ts.reset(token)
+    
     def get_platform_recommendations(self, content: str) -> Dict:
         """
         Get recommendations for which platforms content is best suited for.
@@ -264,36 +1109,22 @@ class ContentOptimizer:
         
         try:
             # Create an analysis prompt
-            prompt = f"""
-            Analyze this content and recommend which social media platforms it would perform best on.
-            Rate each platform (Facebook, Twitter, Instagram, TikTok) on a scale of 1-10 for this content.
-            
-            Content: "{content}"
-            
-            Format the response as JSON with platform names as keys and scores as values.
-            Include a brief explanation for each platform's score.
-            """
+            prompt = _RECOMMENDATION_PROMPT.format(content=content)
             
             # Generate analysis
-            analysis = self.text_llm.generate_text(prompt, max_tokens=500, temperature=0.3)
+            analysis, cache_hit = self._cached_generate(
+                prompt, max_tokens=500, temperature=self.recommendation_temperature
+            )
             
             # Parse the response
             try:
-                # Check if the response is wrapped in ```json and ``` markers
-                if "```json" in analysis:
-                    json_str = analysis.split("```json")[1].split("```")[0].strip()
-                elif "```" in analysis:
-                    json_str = analysis.split("```")[1].strip()
-                else:
-                    json_str = analysis.strip()
-                
-                import json
-                recommendations = json.loads(json_str)
+                recommendations = _extract_json(analysis)
                 
                 result = {
                     "content": content,
                     "recommendations": recommendations,
-                    "analyzed_at": datetime.datetime.now().isoformat(),
+                    "analyzed_at": _now_iso(),
+                    "cache_hit": cache_hit,
                     "success": True
                 }
                 
@@ -309,6 +1140,61 @@ class ContentOptimizer:
             logger.error(f"Error getting platform recommendations: {e}")
             return {"success": False, "error": str(e)}
     
+    def get_platform_recommendations_batch(self, contents: List[str]) -> List[Dict]:
+        """
+        Get platform recommendations for several pieces of content.
+        
+        Up to batch_size items (config "batch_size", default 10) are rated in a
+        single LLM request. If a batched response cannot be parsed, the items
+        in that batch are analyzed one at a time instead.
+        
+        Args:
+            contents: Contents to analyze
+        
+        Returns:
+            List of platform recommendation dicts, one per content item, in order
+        """
+        if not self.text_llm:
+            logger.error("No text LLM provider configured")
+            return [{"success": False, "error": "No text LLM provider configured"} for _ in contents]
+        
+        batch_size = max(1, self.config.get("batch_size", 10))
+        results = []
+        
+        for start in range(0, len(contents), batch_size):
+            batch = contents[start:start + batch_size]
+            if len(batch) == 1:
+                results.append(self.get_platform_recommendations(batch[0]))
+                continue
+            
+            items = "\n".join(f'[{i}] "{content}"' for i, content in enumerate(batch, 1))
+            prompt = _BATCH_RECOMMENDATION_PROMPT.format(count=len(batch), items=items)
+            
+            try:
+                analysis, cache_hit = self._cached_generate(
+                    prompt, max_tokens=500 * len(batch), temperature=self.recommendation_temperature
+                )
+                
+                recommendations = _extract_json(analysis)
+                if not isinstance(recommendations, list) or len(recommendations) != len(batch):
+                    raise ValueError(f"expected a JSON array of {len(batch)} items")
+            except Exception as e:
+                logger.warning("Batched platform recommendations failed (%s), analyzing items individually", e)
+                results.extend(self.get_platform_recommendations(content) for content in batch)
+                continue
+            
+            analyzed_at = _now_iso()
+            for content, item in zip(batch, recommendations):
+                results.append({
+                    "content": content,
+                    "recommendations": item,
+                    "analyzed_at": analyzed_at,
+                    "cache_hit": cache_hit,
+                    "success": True
+                })
+        
+        return results
+    
     def get_content_improvement_suggestions(self, content: str, platform: str) -> Dict:
         """
         Get suggestions for improving content for a specific platform.
@@ -324,51 +1210,26 @@ class ContentOptimizer:
             logger.error("No text LLM provider configured")
             return {"success": False, "error": "No text LLM provider configured"}
         
-        # Get platform-specific settings
-        platform_settings = self.platform_settings.get(platform.lower(), {})
-        
         try:
             # Create an analysis prompt
-            prompt = f"""
-            Analyze this {platform} content and provide specific suggestions for improvement:
-            
-            Content: "{content}"
-            
-            Platform guidelines:
-            - Text length: optimal {platform_settings.get('text_length', {}).get('optimal', 'appropriate')} characters
-            - Hashtags: optimal {platform_settings.get('hashtags', {}).get('optimal', 'appropriate')} hashtags
-            - Tone: {platform_settings.get('tone', 'appropriate for platform')}
-            - Emojis: {"include appropriate emojis" if platform_settings.get('emojis', True) else "minimize emoji use"}
-            
-            Format the response as JSON with these fields:
-            - overall_score: 1-10 rating of the content
-            - strengths: array of content strengths
-            - weaknesses: array of content weaknesses
-            - suggestions: array of specific improvement suggestions
-            - improved_version: an improved version of the content
-            """
+            prefix = self._get_cfg(platform).improvement_prefix
+            if prefix is None:
+                prefix = _IMPROVEMENT_PREFIX.format(platform=platform, guidelines=_render_guidelines({}, with_max=False))
+            prompt = prefix + _IMPROVEMENT_SUFFIX.format(content=content)
             
             # Generate analysis
-            analysis = self.text_llm.generate_text(prompt, max_tokens=800, temperature=0.4)
+            analysis, cache_hit = self._cached_generate(prompt, max_tokens=800, temperature=0.4)
             
             # Parse the response
             try:
-                # Check if the response is wrapped in ```json and ``` markers
-                if "```json" in analysis:
-                    json_str = analysis.split("```json")[1].split("```")[0].strip()
-                elif "```" in analysis:
-                    json_str = analysis.split("```")[1].strip()
-                else:
-                    json_str = analysis.strip()
-                
-                import json
-                suggestions = json.loads(json_str)
+                suggestions = ImprovementSuggestions.model_validate_json(_json_body(analysis)).model_dump()
                 
                 result = {
                     "content": content,
                     "platform": platform,
                     "suggestions": suggestions,
-                    "analyzed_at": datetime.datetime.now().isoformat(),
+                    "analyzed_at": _now_iso(),
+                    "cache_hit": cache_hit,
                     "success": True
                 }
                 
@@ -395,6 +1256,6 @@ class ContentOptimizer:
         Returns:
             List of optimization history items
         """
-        filtered_history = self.optimization_history
+        filtered_history = list(self.optimization_history)
         
    <response clipped><NOTE>To save on context only part of this file has been shown to you. You should retry this tool after you have searched inside the file with `grep -n` in order to find the line numbers of what you are looking for.</NOTE>
\ No newline at end of file
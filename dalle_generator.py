@@ -8,14 +8,232 @@ using the OpenAI API (DALL-E models).
 import logging
 import json
 import os
-import requests
 import base64
-from typing import Dict, List, Optional, Any
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import re
+import threading
+import types
+from typing import Dict, List, Optional, Any, Tuple, Union
 
 from .base_image_generator import BaseImageGenerator
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # SIMD-accelerated (AVX2/AVX-512/NEON) drop-in for base64.b64encode
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    from base64 import b64encode as _b64encode
+
 logger = logging.getLogger("llm_integration.dalle_generator")
 
+# Most image generation requests in flight at once, across all generators,
+# to stay within the API's rate limits
+MAX_CONCURRENT_GENERATIONS = 5
+_generation_slots = threading.BoundedSemaphore(MAX_CONCURRENT_GENERATIONS)
+
+# Request parameter values the API accepts, and the aliases mapped onto them
+_SUPPORTED_SIZES = frozenset({"256x256", "512x512", "1024x1024", "1792x1024", "1024x1792"})
+_STYLE_VIVID = frozenset({"vivid", "artistic"})
+_FORMAT_B64 = frozenset({"b64_json", "base64"})
+
+# Recommended image size per platform, and the closest size DALL-E supports
+_PLATFORM_SIZES = types.MappingProxyType({
+    "facebook": "1200x630",
+    "twitter": "1200x675",
+    "instagram": "1080x1080",
+    "tiktok": "1080x1920"
+})
+_SIZE_MAPPING = types.MappingProxyType({
+    "1200x630": "1024x1024",  # Facebook
+    "1200x675": "1024x1024",  # Twitter
+    "1080x1080": "1024x1024",  # Instagram
+    "1080x1920": "1024x1792"   # TikTok
+})
+
+# Image descriptions used when generating new images and optimizing existing ones
+_GENERATION_DESCRIPTIONS = types.MappingProxyType({
+    "facebook": "Facebook post image with clear focal point and minimal text",
+    "twitter": "Twitter post image with bold colors and clear subject",
+    "instagram": "Instagram square image with vibrant colors and aesthetic composition",
+    "tiktok": "TikTok vertical image with attention-grabbing visuals"
+})
+_OPTIMIZATION_DESCRIPTIONS = types.MappingProxyType({
+    "facebook": "optimized for Facebook with clear focal point and minimal text",
+    "twitter": "optimized for Twitter with bold colors and clear subject",
+    "instagram": "optimized for Instagram with vibrant colors and aesthetic composition",
+    "tiktok": "optimized for TikTok with attention-grabbing visuals"
+})
+
+# Per platform: (DALL-E size, generation description, optimization description, recommended size)
+_PLATFORM_TABLE = types.MappingProxyType({
+    platform: (
+        _SIZE_MAPPING[recommended_size],
+        _GENERATION_DESCRIPTIONS[platform],
+        _OPTIMIZATION_DESCRIPTIONS[platform],
+        recommended_size
+    )
+    for platform, recommended_size in _PLATFORM_SIZES.items()
+})
+# Row for unknown platforms; the optimization description is filled in per platform
+_DEFAULT_ROW = ("1024x1024", "Social media image", None, "1024x1024")
+
+_SOCIAL_MEDIA_PROMPT = ("Create a {style} {description} about {topic}. "
+                        "The image should be optimized for {platform} and be visually engaging. "
+                        "Do not include any text in the image.")
+_OPTIMIZE_PREFIX = "Recreate this image {optimization}: "
+
+# Slight variations of the prompt for image variations, used in turn
+_VARIATION_PROMPTS = (
+    "Create a variation of this image: {description}",
+    "Generate an alternative version of this image: {description}",
+    "Create a similar image with different details: {description}",
+    "Reimagine this image with a different perspective: {description}"
+)
+
+_URL_PREFIXES = ("http://", "https://")
+
+# (connect, read) timeouts in seconds for downloading generated images
+_DOWNLOAD_TIMEOUT = (5, 120)
+
+# Shape of an OpenAI API key, checked locally before asking the API
+_OPENAI_API_BASE = "https://api.openai.com/"
+_KEY_RE = re.compile(r"sk-[A-Za-z0-9_\-]{20,}")
+
+def _dumps(data: Any) -> bytes:
+    """
+    Serialize a request body to JSON.
+    
+    Args:
+        data: JSON-serializable request data
+        
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    return orjson.dumps(data) if orjson is not None else json.dumps(data).encode("utf-8")
+
+@functools.lru_cache(maxsize=64)
+def _generation_body_prefix(model: str, size: str, style: str, response_format: str) -> bytes:
+    """
+    Serialize the fixed fields of an image generation request body.
+    
+    Args:
+        model: DALL-E model
+        size: DALL-E image size
+        style: DALL-E style
+        response_format: "url" or "b64_json"
+        
+    Returns:
+        bytes: The JSON object up to the prompt value, completed by
+            appending the serialized prompt and a closing brace
+    """
+    fixed = _dumps({
+        "model": model,
+        "n": 1,
+        "size": size,
+        "style": style,
+        "response_format": response_format
+    })
+    return fixed[:-1] + b',"prompt":'
+
+def _loads(response: Any) -> Any:
+    """
+    Parse a JSON response body.
+    
+    Args:
+        response: HTTP response
+        
+    Returns:
+        The parsed JSON value
+    """
+    return orjson.loads(response.content) if orjson is not None else response.json()
+
+def _social_media_prompt(platform: str, topic: str, style: str) -> Tuple[str, str, str]:
+    """
+    Build the prompt and sizes for a social media image.
+    
+    Args:
+        platform: Target social media platform
+        topic: Topic or subject of the image
+        style: Style of the image
+        
+    Returns:
+        Tuple of the prompt, DALL-E size and recommended size
+    """
+    dalle_size, description, _, recommended_size = _PLATFORM_TABLE.get(platform.lower(), _DEFAULT_ROW)
+    prompt = _SOCIAL_MEDIA_PROMPT.format(style=style, description=description,
+                                         topic=topic, platform=platform)
+    return prompt, dalle_size, recommended_size
+
+@functools.lru_cache(maxsize=64)
+def _optimize_prompt_prefix(platform: str) -> Tuple[str, str, str]:
+    """
+    Build the platform part of the prompt for recreating an image.
+    
+    Args:
+        platform: Target platform
+        
+    Returns:
+        Tuple of the prompt prefix (to be followed by the image description),
+        DALL-E size and recommended size
+    """
+    dalle_size, _, optimization, recommended_size = _PLATFORM_TABLE.get(platform.lower(), _DEFAULT_ROW)
+    if optimization is None:
+        optimization = f"optimized for {platform}"
+    return _OPTIMIZE_PREFIX.format(optimization=optimization), dalle_size, recommended_size
+
+def _file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Hash a file's contents without reading it into memory whole.
+    
+    Args:
+        path: Path to the file
+        chunk_size: Bytes hashed at a time
+        
+    Returns:
+        str: BLAKE2b-128 hex digest of the file contents
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _b64encode_file(path: str, chunk_size: int = 57 * 1024) -> str:
+    """
+    Base64-encode a file without reading it into memory whole.
+    
+    Args:
+        path: Path to the file
+        chunk_size: Bytes encoded at a time; a multiple of 3, so chunks encode
+            without padding and concatenate to the encoding of the whole file
+        
+    Returns:
+        str: Base64 encoding of the file contents
+    """
+    out = bytearray(4 * ((os.path.getsize(path) + 2) // 3))
+    pos = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            encoded = _b64encode(chunk)
+            out[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+    # The file may have changed size since it was measured
+    del out[pos:]
+    return out.decode("ascii")
+
 class DALLEGenerator(BaseImageGenerator):
     """
     DALL-E Image Generator for creating images.
@@ -23,6 +241,9 @@ class DALLEGenerator(BaseImageGenerator):
     This class implements the BaseImageGenerator interface for OpenAI's DALL-E models.
     """
     
+    __slots__ = ('model', 'api_base', 'timeout', '_headers', '_http2_client',
+                 '_vision_cache', '_vision_cache_size', '_vision_cache_lock')
+    
     def __init__(self, config: Dict = None):
         """
         Initialize the DALL-E image generator.
@@ -35,11 +256,40 @@ class DALLEGenerator(BaseImageGenerator):
         self.api_key = self.config.get("api_key")
         self.model = self.config.get("model", "dall-e-3")
         self.api_base = self.config.get("api_base", "https://api.openai.com/v1")
+        # (connect, read) timeouts in seconds for API requests
+        self.timeout = self.config.get("timeout", (5, 60))
+        
+        # Request headers, built once; the session may be shared with other
+        # providers, so they are not set on it
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
         
-        logger.info(f"DALL-E Generator initialized with model: {self.model}")
+        # Optional HTTP/2 client (httpx) for the API calls
+        self._http2_client = None
+        if self.config.get("http2", False):
+            try:
+                import httpx
+                
+                connect, read = self.timeout if isinstance(self.timeout, tuple) else (self.timeout, self.timeout)
+                self._http2_client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+                    timeout=httpx.Timeout(read, connect=connect)
+                )
+            except ImportError as e:
+                logger.warning("HTTP/2 unavailable, using HTTP/1.1: %s", e)
+        
+        # Vision API descriptions keyed by (image content digest, instruction)
+        self._vision_cache = collections.OrderedDict()
+        self._vision_cache_size = self.config.get("vision_cache_size", 128)
+        self._vision_cache_lock = threading.Lock()
+        
+        logger.info("DALL-E Generator initialized with model: %s", self.model)
     
     def generate_image(self, prompt: str, size: str = "1024x1024", 
-                      style: str = "natural", format: str = "url") -> Dict:
+                      style: str = "natural", format: str = "url", download: bool = False) -> Dict:
         """
         Generate an image using DALL-E.
         
@@ -48,6 +298,8 @@ class DALLEGenerator(BaseImageGenerator):
             size: Size of the image (e.g., "1024x1024")
             style: Style of the image (e.g., "natural", "vivid")
             format: Output format ("url" or "b64_json")
+            download: Also download a URL-format image, adding its "bytes" and
+                "sha256" to the result (or "download_error" if that fails)
             
         Returns:
             Dict containing the generated image data
@@ -56,59 +308,47 @@ class DALLEGenerator(BaseImageGenerator):
             return {"success": False, "error": "Invalid API key"}
         
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
             # Map style to DALL-E style parameter
-            dalle_style = "natural"
-            if style.lower() in ["vivid", "artistic"]:
-                dalle_style = "vivid"
+            dalle_style = "vivid" if style.lower() in _STYLE_VIVID else "natural"
             
             # Map size to DALL-E size parameter
-            dalle_size = "1024x1024"
-            if size in ["256x256", "512x512", "1024x1024", "1792x1024", "1024x1792"]:
-                dalle_size = size
+            dalle_size = size if size in _SUPPORTED_SIZES else "1024x1024"
             
             # Map format to DALL-E response_format parameter
-            response_format = "url"
-            if format.lower() in ["b64_json", "base64"]:
-                response_format = "b64_json"
+            response_format = "b64_json" if format.lower() in _FORMAT_B64 else "url"
             
-            data = {
-                "model": self.model,
-                "prompt": prompt,
-                "n": 1,
-                "size": dalle_size,
-                "style": dalle_style,
-                "response_format": response_format
-            }
+            # Only the prompt is serialized per call
+            data = _generation_body_prefix(self.model, dalle_size, dalle_style, response_format) + _dumps(prompt) + b"}"
             
-            response = requests.post(
-                f"{self.api_base}/images/generations",
-                headers=headers,
-                json=data
-            )
+            with _generation_slots:
+                response = self._post(f"{self.api_base}/images/generations", data)
             
             if response.status_code == 200:
-                result = response.json()
-                image_data = result["data"][0]
+                images = _loads(response).get("data") or [{}]
+                image = images[0].get("url") if response_format == "url" else images[0].get("b64_json")
+                if not image:
+                    logger.error("DALL-E API response contained no image data")
+                    return {"success": False, "error": "No image data in response"}
                 
-                return {
+                result = {
                     "success": True,
                     "format": response_format,
-                    "data": image_data.get("url") if response_format == "url" else image_data.get("b64_json"),
+                    "data": image,
                     "prompt": prompt
                 }
+                if download and response_format == "url":
+                    result.update(self._download(image))
+                return result
             else:
-                logger.error(f"DALL-E API error: {response.text}")
+                # Decoded once for both the log and the result
+                error_text = response.text
+                logger.error("DALL-E API error: %s", error_text)
                 return {
                     "success": False,
-                    "error": f"Error {response.status_code}: {response.text}"
+                    "error": f"Error {response.status_code}: {error_text}"
                 }
         except Exception as e:
-            logger.error(f"Error generating image with DALL-E: {e}")
+            logger.error("Error generating image with DALL-E: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -127,48 +367,8 @@ class DALLEGenerator(BaseImageGenerator):
         Returns:
             Dict containing the generated image data
         """
-        # Define platform-specific image requirements
-        platform_specs = {
-            "facebook": {
-                "size": "1200x630",
-                "description": "Facebook post image with clear focal point and minimal text"
-            },
-            "twitter": {
-                "size": "1200x675",
-                "description": "Twitter post image with bold colors and clear subject"
-            },
-            "instagram": {
-                "size": "1080x1080",
-                "description": "Instagram square image with vibrant colors and aesthetic composition"
-            },
-            "tiktok": {
-                "size": "1080x1920",
-                "description": "TikTok vertical image with attention-grabbing visuals"
-            }
-        }
-        
-        # Get platform specifications
-        platform_info = platform_specs.get(platform.lower(), {
-            "size": "1024x1024",
-            "description": "Social media image"
-        })
-        
-        # Create a detailed prompt for the image
-        prompt = f"""
-        Create a {style} {platform_info['description']} about {topic}.
-        The image should be optimized for {platform} and be visually engaging.
-        Do not include any text in the image.
-        """
-        
-        # Map platform size to DALL-E supported sizes
-        size_mapping = {
-            "1200x630": "1024x1024",  # Facebook
-            "1200x675": "1024x1024",  # Twitter
-            "1080x1080": "1024x1024",  # Instagram
-            "1080x1920": "1024x1792"   # TikTok
-        }
-        
-        dalle_size = size_mapping.get(platform_info["size"], "1024x1024")
+        # Create a detailed prompt for the image, at the platform's size
+        prompt, dalle_size, recommended_size = _social_media_prompt(platform, topic, style)
         
         # Generate the image
         result = self.generate_image(
@@ -182,17 +382,18 @@ class DALLEGenerator(BaseImageGenerator):
         if result["success"]:
             result["platform"] = platform
             result["topic"] = topic
-            result["recommended_size"] = platform_info["size"]
+            result["recommended_size"] = recommended_size
         
         return result
     
-    def generate_variations(self, image_path: str, variations: int = 3) -> List[Dict]:
+    def generate_variations(self, image_path: str, variations: int = 3, download: bool = False) -> List[Dict]:
         """
         Generate variations of an existing image using DALL-E.
         
         Args:
-            image_path: Path to the original image
+            image_path: Path or http(s) URL of the original image
             variations: Number of variations to generate
+            download: Also download each variation (see generate_image)
             
         Returns:
             List of dictionaries containing the generated image variations
@@ -200,7 +401,7 @@ class DALLEGenerator(BaseImageGenerator):
         if not self.validate_api_key():
             return [{"success": False, "error": "Invalid API key"}]
         
-        if not os.path.exists(image_path):
+        if not image_path.startswith(_URL_PREFIXES) and not os.path.exists(image_path):
             return [{"success": False, "error": f"Image file not found: {image_path}"}]
         
         try:
@@ -208,79 +409,36 @@ class DALLEGenerator(BaseImageGenerator):
             # Instead, we'll analyze the image and create a detailed prompt
             
             # First, let's create a description of the image using GPT-4 Vision
-            with open(image_path, "rb") as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode('utf-8')
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # Request image description from GPT-4 Vision
-            vision_data = {
-                "model": "gpt-4-vision-preview",
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "Describe this image in detail so it could be recreated by an image generation AI. Focus on subject, composition, colors, style, and mood."
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                "max_tokens": 300
-            }
-            
-            vision_response = requests.post(
-                f"{self.api_base}/chat/completions",
-                headers=headers,
-                json=vision_data
+            description, error = self._describe_image(
+                image_path,
+                "Describe this image in detail so it could be recreated by an image generation AI. Focus on subject, composition, colors, style, and mood.",
+                max_tokens=300
             )
+            if description is None:
+                return [{"success": False, "error": f"Error analyzing image: {error}"}]
             
-            if vision_response.status_code != 200:
-                logger.error(f"Error getting image description: {vision_response.text}")
-                return [{"success": False, "error": f"Error analyzing image: {vision_response.text}"}]
-            
-            # Extract the image description
-            description = vision_response.json()["choices"][0]["message"]["content"]
-            
-            # Generate variations based on the description
-            results = []
-            for i in range(variations):
-                # Add slight variations to the prompt for each iteration
-                variation_prompts = [
-                    f"Create a variation of this image: {description}",
-                    f"Generate an alternative version of this image: {description}",
-                    f"Create a similar image with different details: {description}",
-                    f"Reimagine this image with a different perspective: {description}"
-                ]
-                
-                prompt = variation_prompts[i % len(variation_prompts)]
-                
-                # Generate the variation
+            def generate_variation(i: int) -> Dict:
                 result = self.generate_image(
-                    prompt=prompt,
+                    prompt=_VARIATION_PROMPTS[i % len(_VARIATION_PROMPTS)].format(description=description),
                     size="1024x1024",
                     style="natural",
-                    format="url"
+                    format="url",
+                    download=download
                 )
                 
                 result["variation_number"] = i + 1
                 result["original_image"] = image_path
-                
-                results.append(result)
+                return result
+            
+            if variations <= 0:
+                return []
             
-            return results
+            # Generate the variations concurrently, keeping them in order
+            workers = min(variations, MAX_CONCURRENT_GENERATIONS)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(generate_variation, range(variations)))
         except Exception as e:
-            logger.error(f"Error generating image variations with DALL-E: {e}")
+            logger.error("Error generating image variations with DALL-E: %s", e)
             return [{"success": False, "error": str(e)}]
     
     def optimize_for_platform(self, image_path: str, platform: str) -> Dict:
@@ -288,7 +446,7 @@ class DALLEGenerator(BaseImageGenerator):
         Optimize an image for a specific platform using DALL-E.
         
         Args:
-            image_path: Path to the original image
+            image_path: Path or http(s) URL of the original image
             platform: Target platform
             
         Returns:
@@ -297,93 +455,24 @@ class DALLEGenerator(BaseImageGenerator):
         if not self.validate_api_key():
             return {"success": False, "error": "Invalid API key"}
         
-        if not os.path.exists(image_path):
+        if not image_path.startswith(_URL_PREFIXES) and not os.path.exists(image_path):
             return {"success": False, "error": f"Image file not found: {image_path}"}
         
         try:
-            # Define platform-specific image requirements
-            platform_specs = {
-                "facebook": {
-                    "size": "1200x630",
-                    "description": "optimized for Facebook with clear focal point and minimal text"
-                },
-                "twitter": {
-                    "size": "1200x675",
-                    "description": "optimized for Twitter with bold colors and clear subject"
-                },
-                "instagram": {
-                    "size": "1080x1080",
-                    "description": "optimized for Instagram with vibrant colors and aesthetic composition"
-                },
-                "tiktok": {
-                    "size": "1080x1920",
-                    "description": "optimized for TikTok with attention-grabbing visuals"
-                }
-            }
-            
             # Get platform specifications
-            platform_info = platform_specs.get(platform.lower(), {
-                "size": "1024x1024",
-                "description": f"optimized for {platform}"
-            })
+            prompt_prefix, dalle_size, recommended_size = _optimize_prompt_prefix(platform)
             
             # First, analyze the image to get a description
-            with open(image_path, "rb") as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode('utf-8')
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # Request image description from GPT-4 Vision
-            vision_data = {
-                "model": "gpt-4-vision-preview",
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "Describe this image briefly focusing on the main subject and style."
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                "max_tokens": 100
-            }
-            
-            vision_response = requests.post(
-                f"{self.api_base}/chat/completions",
-                headers=headers,
-                json=vision_data
+            description, error = self._describe_image(
+                image_path,
+                "Describe this image briefly focusing on the main subject and style.",
+                max_tokens=100
             )
-            
-            if vision_response.status_code != 200:
-                logger.error(f"Error getting image description: {vision_response.text}")
-                return {"success": False, "error": f"Error analyzing image: {vision_response.text}"}
-            
-            # Extract the image description
-            description = vision_response.json()["choices"][0]["message"]["content"]
+            if description is None:
+                return {"success": False, "error": f"Error analyzing image: {error}"}
             
             # Create a prompt for the optimized image
-            prompt = f"Recreate this image {platform_info['description']}: {description}"
-            
-            # Map platform size to DALL-E supported sizes
-            size_mapping = {
-                "1200x630": "1024x1024",  # Facebook
-                "1200x675": "1024x1024",  # Twitter
-                "1080x1080": "1024x1024",  # Instagram
-                "1080x1920": "1024x1792"   # TikTok
-            }
-            
-            dalle_size = size_mapping.get(platform_info["size"], "1024x1024")
+            prompt = prompt_prefix + description
             
             # Generate the optimized image
             result = self.generate_image(
@@ -397,16 +486,142 @@ class DALLEGenerator(BaseImageGenerator):
             if result["success"]:
                 result["platform"] = platform
                 result["original_image"] = image_path
-                result["recommended_size"] = platform_info["size"]
+                result["recommended_size"] = recommended_size
             
             return result
         except Exception as e:
-            logger.error(f"Error optimizing image with DALL-E: {e}")
+            logger.error("Error optimizing image with DALL-E: %s", e)
             return {"success": False, "error": str(e)}
     
-    def validate_api_key(self) -> bool:
+    def _post(self, url: str, data: Union[Dict, bytes]) -> Any:
         """
-        Validate the DALL-E API key.
+        POST a JSON request to the API.
+        
+        With the "http2" config option set and httpx (with HTTP/2 support)
+        installed, requests go through one multiplexed HTTP/2 connection;
+        otherwise through the provider's pooled requests session.
+        
+        Args:
+            url: Request URL
+            data: JSON request body, or the body already serialized
+            
+        Returns:
+            HTTP response (requests or httpx)
+        """
+        body = data if isinstance(data, bytes) else _dumps(data)
+        if self._http2_client is not None:
+            response = self._http2_client.post(url, headers=self._headers, content=body)
+        else:
+            response = self.http().post(url, headers=self._headers, data=body, timeout=self.timeout)
+        
+        # The key was revoked since it was validated; check it again on the next call
+        if response.status_code == 401:
+            self._validation_cache = (None, 0.0)
+        return response
+    
+    def _download(self, url: str) -> Dict:
+        """
+        Download a generated image over the pooled session.
+        
+        Args:
+            url: URL of the generated image
+            
+        Returns:
+            Dict with the image "bytes" and their "sha256", or a "download_error"
+        """
+        try:
+            buf = bytearray()
+            digest = hashlib.sha256()
+            with self.http().get(url, stream=True, timeout=_DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    buf += chunk
+                    digest.update(chunk)
+            return {"bytes": bytes(buf), "sha256": digest.hexdigest()}
+        except Exception as e:
+            # The image was generated (and billed); keep the URL result usable
+            logger.error("Error downloading generated image: %s", e)
+            return {"download_error": str(e)}
+    
+    def close(self) -> None:
+        """
+        Close the HTTP/2 client and, if this provider created it, the HTTP session.
+        """
+        if self._http2_client is not None:
+            self._http2_client.close()
+            self._http2_client = None
+        super().close()
+    
+    def _describe_image(self, image_path: str, instruction: str, max_tokens: int) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Describe an image with GPT-4 Vision, reusing earlier descriptions of the same image.
+        
+        Remote images are passed to the API by URL. Local files are sent inline
+        as base64; their descriptions are cached by the file's content digest and
+        the instruction, so an unchanged file is not uploaded again.
+        
+        Args:
+            image_path: Path or http(s) URL of the image
+            instruction: What the description should cover
+            max_tokens: Maximum number of tokens in the description
+            
+        Returns:
+            Tuple of the description (None on failure) and the API error text
+        """
+        is_url = image_path.startswith(_URL_PREFIXES)
+        key = (image_path if is_url else _file_digest(image_path), instruction)
+        with self._vision_cache_lock:
+            description = self._vision_cache.get(key)
+            if description is not None:
+                self._vision_cache.move_to_end(key)
+                return description, None
+        
+        image_url = image_path if is_url else f"data:image/jpeg;base64,{_b64encode_file(image_path)}"
+        
+        # Request image description from GPT-4 Vision
+        vision_data = {
+            "model": "gpt-4-vision-preview",
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": instruction
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": image_url
+                            }
+                        }
+                    ]
+                }
+            ],
+            "max_tokens": max_tokens
+        }
+        
+        vision_response = self._post(f"{self.api_base}/chat/completions", vision_data)
+        
+        if vision_response.status_code != 200:
+            error_text = vision_response.text
+            logger.error("Error getting image description: %s", error_text)
+            return None, error_text
+        
+        # Extract the image description
+        description = _loads(vision_response)["choices"][0]["message"]["content"]
+        
+        with self._vision_cache_lock:
+            self._vision_cache[key] = description
+            self._vision_cache.move_to_end(key)
+            while len(self._vision_cache) > self._vision_cache_size:
+                self._vision_cache.popitem(last=False)
+        
+        return description, None
+    
+    def _check_api_key(self) -> bool:
+        """
+        Check the DALL-E API key against the API.
         
         Returns:
             bool: Whether the API key is valid
@@ -415,12 +630,15 @@ class DALLEGenerator(BaseImageGenerator):
             logger.error("No DALL-E API key provided")
             return False
         
+        # Reject malformed OpenAI keys without a round trip (other API bases
+        # such as proxies may use their own key format)
+        if self.api_base.startswith(_OPENAI_API_BASE) and not _KEY_RE.fullmatch(self.api_key):
+            logger.error("Malformed DALL-E API key")
+            return False
+        
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+            headers = self._headers
             
-            response = requests.get(
+            response = self.http().get(
                 f"{self.api_base}/models",
                <response clipped><NOTE>To save on context only part of this file has been shown to you. You should retry this tool after you have searched inside the file with `grep -n` in order to find the line numbers of what you are looking for.</NOTE>
\ No newline at end of file
@@ -5,17 +5,157 @@ This module implements the Facebook-specific functionality for posting content,
 retrieving metrics, and managing the Facebook social media presence.
 """
 
+import asyncio
+import concurrent.futures
 import datetime
+import functools
 import logging
 import json
+import mimetypes
 import os
-import requests
-from typing import Dict, List, Optional, Any
+import threading
+import time
+import types
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urlencode
 
 from .base_agent import BasePlatformAgent
+from ..llm_integration.base_provider import TokenBucket, new_http_session
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Streams multipart uploads instead of building the whole body in memory
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
 
 logger = logging.getLogger("platform_agents.facebook")
 
+# Most requests the Graph API accepts in one batch request
+GRAPH_BATCH_LIMIT = 50
+
+# Query parameters that are the same for every request of a kind (the
+# access token is sent by the session)
+_AUTH_PARAMS = types.MappingProxyType({"fields": "name,id"})
+_POST_INSIGHTS_PARAMS = types.MappingProxyType({
+    "metric": "post_impressions,post_engagements,post_reactions_by_type_total"
+})
+_POST_FIELDS_PARAMS = types.MappingProxyType({"fields": "shares,comments.summary(true)"})
+
+# Reaction types reported in post metrics
+_REACTION_KEYS = ("like", "love", "wow", "haha", "sad", "angry")
+
+# Graph API error codes for throttled requests (application, user, page and
+# API-specific rate limits); such requests were not carried out
+GRAPH_RATE_LIMIT_CODES = frozenset({4, 17, 32, 613})
+
+# Times a throttled request is sent again, with exponential backoff
+RATE_LIMIT_RETRIES = 3
+
+# Graph API usage (percent of the rate limit) above which requests are slowed down
+GRAPH_USAGE_SLOWDOWN = 80
+
+# Usage headers, and the percentages they report
+_USAGE_HEADERS = ("X-App-Usage", "X-Page-Usage")
+_USAGE_KEYS = ("call_count", "total_cputime", "total_time")
+
+# Local videos larger than this are uploaded in chunks (resumable upload)
+RESUMABLE_UPLOAD_THRESHOLD = 50 * 1024 * 1024
+
+# Times a failed video chunk is sent again before the upload is abandoned
+VIDEO_CHUNK_RETRIES = 3
+
+def _loads(response: Any) -> Any:
+    """
+    Parse a JSON response body.
+    
+    Args:
+        response: HTTP response
+        
+    Returns:
+        The parsed JSON value
+    """
+    return orjson.loads(response.content) if orjson is not None else response.json()
+
+def _graph_error_code(response: Any) -> Optional[int]:
+    """
+    Get the Graph API error code of a failed response.
+    
+    Args:
+        response: HTTP response
+        
+    Returns:
+        The error code, or None if the request succeeded or the body has none
+    """
+    if response.status_code < 400:
+        return None
+    try:
+        return _loads(response).get("error", {}).get("code")
+    except (ValueError, AttributeError):
+        return None
+
+def _graph_usage(headers: Any) -> Optional[float]:
+    """
+    Get the highest rate limit usage reported in Graph API response headers.
+    
+    Args:
+        headers: Response headers
+        
+    Returns:
+        Usage as a percentage of the rate limit, or None if not reported
+    """
+    reports = []
+    try:
+        for name in _USAGE_HEADERS:
+            if name in headers:
+                reports.append(json.loads(headers[name]))
+        if "X-Business-Use-Case-Usage" in headers:
+            for entries in json.loads(headers["X-Business-Use-Case-Usage"]).values():
+                reports.extend(entries)
+    except ValueError:
+        return None
+    
+    usage = [report[key] for report in reports for key in _USAGE_KEYS if key in report]
+    return max(usage) if usage else None
+
+@functools.lru_cache(maxsize=512)
+def _day_bounds(date: datetime.date) -> Tuple[int, int]:
+    """
+    Get the Unix timestamps of the start and end of a day, in local time.
+    
+    Args:
+        date: Day to get the bounds of
+        
+    Returns:
+        Tuple of the since and until timestamps
+    """
+    since = int(datetime.datetime.combine(date, datetime.time.min).timestamp())
+    until = int(datetime.datetime.combine(date, datetime.time.max).timestamp())
+    return since, until
+
+class _BatchResponse:
+    """
+    Result of one request in a Graph API batch, with the parts of the
+    requests.Response interface that the agent uses.
+    """
+    
+    __slots__ = ('status_code', 'text')
+    
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+    
+    @property
+    def content(self) -> str:
+        return self.text
+    
+    def json(self) -> Any:
+        return json.loads(self.text)
+
 class FacebookAgent(BasePlatformAgent):
     """
     Facebook Platform Agent for managing Facebook page content and analytics.
@@ -27,6 +167,9 @@ class FacebookAgent(BasePlatformAgent):
     - Optimizing content for Facebook's algorithm
     """
     
+    __slots__ = ('api_base_url', 'access_token', 'page_id', 'session', '_auth_ok_until', '_auth_ttl',
+                 'post_metrics_cache', '_cache_lock', '_rate', '_limiter')
+    
     def __init__(self, config: Dict = None):
         """
         Initialize the Facebook agent.
@@ -40,12 +183,39 @@ class FacebookAgent(BasePlatformAgent):
         self.access_token = self.config.get("access_token")
         self.page_id = self.config.get("page_id")
         
+        # Pooled keep-alive session for Graph API calls, sending the access token with every request
+        self.session = new_http_session(retries=5, backoff_factor=1.0)
+        self.session.params = {"access_token": self.access_token}
+        self.session.hooks["response"].append(self._on_response)
+        
+        # Opt-in client-side rate limit for Graph API calls ("graph_calls_per_hour"),
+        # slowed down as usage nears the API's limit. Without it, only requests
+        # the API throttles are delayed (see _request).
+        calls_per_hour = self.config.get("graph_calls_per_hour")
+        self._rate = calls_per_hour / 3600 if calls_per_hour else None
+        self._limiter = TokenBucket(self._rate, burst=self.config.get("graph_burst", 20)) if self._rate else None
+        
+        # time.monotonic() until which a successful authentication is reused
+        self._auth_ok_until = 0.0
+        self._auth_ttl = self.config.get("auth_ttl", 3600)
+        
+        # metrics_cache (by date) and post_metrics_cache (by post ID) hold
+        # (time.monotonic() expiry, metrics), least recently used first
+        self.post_metrics_cache = {}
+        self._cache_lock = threading.Lock()
+        
         logger.info("Facebook Agent initialized")
     
-    def authenticate(self) -> bool:
+    def authenticate(self, force: bool = False) -> bool:
         """
         Authenticate with the Facebook Graph API.
         
+        A successful authentication is reused for the auth TTL, until an API
+        call reports that the access token is no longer valid.
+        
+        Args:
+            force: Check the access token even if a cached authentication is still fresh
+            
         Returns:
             bool: Success status
         """
@@ -57,16 +227,21 @@ class FacebookAgent(BasePlatformAgent):
             logger.error("Facebook page ID not provided")
             return False
         
+        if not force and time.monotonic() < self._auth_ok_until:
+            return True
+        
         try:
             # Test authentication by getting page info
-            response = requests.get(
+            response = self._request(
+                "GET",
                 f"{self.api_base_url}/{self.page_id}",
-                params={"access_token": self.access_token, "fields": "name,id"}
+                params=_AUTH_PARAMS
             )
             
             if response.status_code == 200:
-                page_info = response.json()
+                page_info = _loads(response)
                 logger.info(f"Successfully authenticated with Facebook page: {page_info.get('name')}")
+                self._auth_ok_until = time.monotonic() + self._auth_ttl
                 return True
             else:
                 logger.error(f"Facebook authentication failed: {response.text}")
@@ -75,6 +250,94 @@ class FacebookAgent(BasePlatformAgent):
             logger.error(f"Error authenticating with Facebook: {e}")
             return False
     
+    def _request(self, method: str, url: str, resend: bool = True, **kwargs) -> Any:
+        """
+        Make a Graph API request, within the client-side rate limit if one is configured.
+        
+        Requests the API throttled (GRAPH_RATE_LIMIT_CODES) are sent again
+        after an exponential backoff, up to RATE_LIMIT_RETRIES times.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            resend: Whether a throttled request can be sent again (not for streamed bodies)
+            **kwargs: Arguments for requests.Session.request
+            
+        Returns:
+            requests.Response
+        """
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            if self._limiter is not None:
+                self._limiter.acquire()
+            response = self.session.request(method, url, **kwargs)
+            if not resend or attempt == RATE_LIMIT_RETRIES or _graph_error_code(response) not in GRAPH_RATE_LIMIT_CODES:
+                return response
+            
+            delay = 2 ** attempt
+            logger.warning("Graph API rate limit reached, retrying in %s s", delay)
+            time.sleep(delay)
+    
+    def _on_response(self, response: Any, *args, **kwargs) -> None:
+        """
+        Drop the cached authentication when the Graph API rejects the access
+        token, and adjust the request rate to the usage the API reports.
+        
+        Args:
+            response: Response to a Graph API request
+        """
+        if response.status_code == 401 or _graph_error_code(response) == 190:
+            # Expired or revoked tokens are reported as OAuthException code 190
+            self._auth_ok_until = 0.0
+        
+        headers = getattr(response, "headers", None)
+        usage = _graph_usage(headers) if headers else None
+        if usage is not None and self._limiter is not None:
+            self._limiter.rate = self._rate / 4 if usage > GRAPH_USAGE_SLOWDOWN else self._rate
+    
+    def _cache_get(self, cache: Dict, key: str) -> Optional[Dict]:
+        """
+        Get unexpired metrics from a metrics cache.
+        
+        Args:
+            cache: metrics_cache or post_metrics_cache
+            key: Date string or post ID
+            
+        Returns:
+            Cached metrics, or None if missing or expired
+        """
+        with self._cache_lock:
+            entry = cache.pop(key, None)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            # Re-inserted as most recently used
+            cache[key] = entry
+            return entry[1]
+    
+    def _cache_put(self, cache: Dict, key: str, metrics: Dict, ttl: float, max_size: int) -> None:
+        """
+        Store metrics in a metrics cache, evicting the least recently used entries.
+        
+        Args:
+            cache: metrics_cache or post_metrics_cache
+            key: Date string or post ID
+            metrics: Metrics to cache
+            ttl: Seconds the metrics stay fresh
+            max_size: Most entries kept in the cache
+        """
+        with self._cache_lock:
+            cache.pop(key, None)
+            cache[key] = (time.monotonic() + ttl, metrics)
+            while len(cache) > max_size:
+                del cache[next(iter(cache))]
+    
+    def clear_metrics_cache(self) -> None:
+        """
+        Clear the metrics and post metrics caches.
+        """
+        with self._cache_lock:
+            super().clear_metrics_cache()
+            self.post_metrics_cache = {}
+    
     def post_content(self, content_type: str, content: Dict) -> Dict:
         """
         Post content to Facebook.
@@ -125,7 +388,6 @@ class FacebookAgent(BasePlatformAgent):
         link = content.get("link")
         
         params = {
-            "access_token": self.access_token,
             "message": message
         }
         
@@ -133,13 +395,14 @@ class FacebookAgent(BasePlatformAgent):
         if link:
             params["link"] = link
         
-        response = requests.post(
+        response = self._request(
+            "POST",
             f"{self.api_base_url}/{self.page_id}/feed",
             params=params
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = _loads(response)
             post_id = result.get("id")
             logger.info(f"Successfully posted text to Facebook, post ID: {post_id}")
             return {"success": True, "post_id": post_id, "platform": "facebook"}
@@ -167,32 +430,25 @@ class FacebookAgent(BasePlatformAgent):
         if image_url:
             # Post image from URL
             params = {
-                "access_token": self.access_token,
                 "message": message,
                 "url": image_url
             }
             
-            response = requests.post(
+            response = self._request(
+                "POST",
                 f"{self.api_base_url}/{self.page_id}/photos",
                 params=params
             )
         else:
             # Post image from file
-            with open(image_path, "rb") as image_file:
-                files = {"source": image_file}
-                params = {
-                    "access_token": self.access_token,
-                    "message": message
-                }
-                
-                response = requests.post(
-                    f"{self.api_base_url}/{self.page_id}/photos",
-                    params=params,
-                    files=files
-                )
+            params = {
+                "message": message
+            }
+            
+            response = self._post_file(f"{self.api_base_url}/{self.page_id}/photos", params, image_path)
         
         if response.status_code == 200:
-            result = response.json()
+            result = _loads(response)
             post_id = result.get("id")
             logger.info(f"Successfully posted image to Facebook, post ID: {post_id}")
             return {"success": True, "post_id": post_id, "platform": "facebook"}
@@ -222,34 +478,30 @@ class FacebookAgent(BasePlatformAgent):
         if video_url:
             # Post video from URL
             params = {
-                "access_token": self.access_token,
                 "file_url": video_url,
                 "description": message,
                 "title": title
             }
             
-            response = requests.post(
+            response = self._request(
+                "POST",
                 f"{self.api_base_url}/{self.page_id}/videos",
                 params=params
             )
         else:
             # Post video from file
-            with open(video_path, "rb") as video_file:
-                files = {"source": video_file}
-                params = {
-                    "access_token": self.access_token,
-                    "description": message,
-                    "title": title
-                }
-                
-                response = requests.post(
-                    f"{self.api_base_url}/{self.page_id}/videos",
-                    params=params,
-                    files=files
-                )
+            params = {
+                "description": message,
+                "title": title
+            }
+            
+            if os.path.getsize(video_path) > RESUMABLE_UPLOAD_THRESHOLD:
+                return self._post_video_resumable(video_path, params)
+            
+            response = self._post_file(f"{self.api_base_url}/{self.page_id}/videos", params, video_path)
         
         if response.status_code == 200:
-            result = response.json()
+            result = _loads(response)
             post_id = result.get("id")
             logger.info(f"Successfully posted video to Facebook, post ID: {post_id}")
             return {"success": True, "post_id": post_id, "platform": "facebook"}
@@ -257,10 +509,166 @@ class FacebookAgent(BasePlatformAgent):
             logger.error(f"Failed to post video to Facebook: {response.text}")
             return {"success": False, "error": response.text}
     
+    def _post_video_resumable(self, video_path: str, params: Dict) -> Dict:
+        """
+        Post a large local video with the Graph API resumable upload protocol.
+        
+        The video is sent in the chunks the API asks for. A failed chunk is
+        sent again (up to VIDEO_CHUNK_RETRIES times) without resending the
+        chunks before it, and the next chunk is read from disk while the
+        current one uploads.
+        
+        Args:
+            video_path: Path to the video file
+            params: Description and title of the video
+            
+        Returns:
+            Dict containing post result
+        """
+        url = f"{self.api_base_url}/{self.page_id}/videos"
+        
+        response = self._request("POST", url, params={
+            "upload_phase": "start",
+            "file_size": os.path.getsize(video_path)
+        })
+        if response.status_code != 200:
+            logger.error(f"Failed to start video upload to Facebook: {response.text}")
+            return {"success": False, "error": response.text}
+        
+        upload = _loads(response)
+        upload_session_id = upload["upload_session_id"]
+        start, end = int(upload["start_offset"]), int(upload["end_offset"])
+        
+        def read(offset: int, size: int) -> bytes:
+            video_file.seek(offset)
+            return video_file.read(size)
+        
+        with open(video_path, "rb") as video_file, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=1) as reader:
+            chunk = read(start, end - start)
+            while start < end:
+                # Assume the next chunk follows on at the same size
+                next_chunk = reader.submit(read, end, end - start)
+                
+                for attempt in range(VIDEO_CHUNK_RETRIES + 1):
+                    response = self._request(
+                        "POST",
+                        url,
+                        params={
+                            "upload_phase": "transfer",
+                            "upload_session_id": upload_session_id,
+                            "start_offset": start
+                        },
+                        files={"video_file_chunk": ("chunk", chunk)}
+                    )
+                    if response.status_code == 200:
+                        break
+                    logger.warning(f"Failed to upload video chunk at offset {start} (attempt {attempt + 1}): {response.text}")
+                else:
+                    logger.error(f"Failed to upload video to Facebook: {response.text}")
+                    return {"success": False, "error": response.text}
+                
+                prefetched = next_chunk.result()
+                offsets = _loads(response)
+                next_start, next_end = int(offsets["start_offset"]), int(offsets["end_offset"])
+                if next_start == end and next_end - next_start == len(prefetched):
+                    chunk = prefetched
+                else:
+                    chunk = read(next_start, next_end - next_start)
+                start, end = next_start, next_end
+        
+        response = self._request("POST", url, params={
+            "upload_phase": "finish",
+            "upload_session_id": upload_session_id,
+            **params
+        })
+        
+        if response.status_code == 200 and _loads(response).get("success"):
+            post_id = upload.get("video_id")
+            logger.info(f"Successfully posted video to Facebook, post ID: {post_id}")
+            return {"success": True, "post_id": post_id, "platform": "facebook"}
+        else:
+            logger.error(f"Failed to post video to Facebook: {response.text}")
+            return {"success": False, "error": response.text}
+    
+    def _graph_batch(self, queries: List[Tuple[str, Dict]]) -> List[Any]:
+        """
+        Make Graph API GET requests through the batch endpoint.
+        
+        Up to GRAPH_BATCH_LIMIT requests are sent per HTTP request, and
+        Facebook processes the requests in a batch in parallel.
+        
+        Args:
+            queries: (URL, query parameters) of each request
+            
+        Returns:
+            List of responses, in the order of queries
+        """
+        prefix = len(self.api_base_url) + 1
+        responses = []
+        for start in range(0, len(queries), GRAPH_BATCH_LIMIT):
+            ops = [
+                {"method": "GET", "relative_url": f"{url[prefix:]}?{urlencode(params)}"}
+                for url, params in queries[start:start + GRAPH_BATCH_LIMIT]
+            ]
+            response = self._request(
+                "POST",
+                self.api_base_url,
+                data={"batch": json.dumps(ops), "include_headers": "false"}
+            )
+            
+            # A failed batch fails each of its requests
+            if response.status_code != 200:
+                responses.extend([response] * len(ops))
+                continue
+            
+            for result in _loads(response):
+                if result is None:
+                    # The request did not finish within the batch's time limit
+                    result = {"code": 504, "body": '{"error": {"message": "Batch request timed out"}}'}
+                op_response = _BatchResponse(result["code"], result["body"])
+                self._on_response(op_response)
+                responses.append(op_response)
+        
+        return responses
+    
+    def _post_file(self, url: str, params: Dict, path: str) -> Any:
+        """
+        Upload a local file as the "source" of a Graph API POST.
+        
+        With requests-toolbelt installed, the multipart body is streamed from
+        the file as it is sent; otherwise requests builds it in memory.
+        
+        Args:
+            url: Request URL
+            params: Query parameters
+            path: Path to the file
+            
+        Returns:
+            requests.Response
+        """
+        with open(path, "rb") as f:
+            if MultipartEncoder is None:
+                return self._request("POST", url, resend=False, params=params, files={"source": f})
+            
+            mime_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            encoder = MultipartEncoder(fields={"source": (os.path.basename(path), f, mime_type)})
+            return self._request(
+                "POST",
+                url,
+                resend=False,
+                params=params,
+                data=encoder,
+                headers={"Content-Type": encoder.content_type}
+            )
+    
     def get_metrics(self, date: datetime.date) -> Dict:
         """
         Get metrics for a specific date.
         
+        Metrics are cached for metrics_cache_ttl seconds (config, default 300),
+        or historical_metrics_ttl (default 86400) for days that have ended.
+        
         Args:
             date: Date to get metrics for
             
@@ -270,88 +678,126 @@ class FacebookAgent(BasePlatformAgent):
         date_str = date.strftime("%Y-%m-%d")
         
         # Check cache first
-        if date_str in self.metrics_cache:
-            return self.metrics_cache[date_str]
+        metrics = self._cache_get(self.metrics_cache, date_str)
+        if metrics is not None:
+            return metrics
         
         if not self.authenticate():
             return {}
         
         try:
-            # Get page insights for the date
-            since = int(datetime.datetime.combine(date, datetime.time.min).timestamp())
-            until = int(datetime.datetime.combine(date, datetime.time.max).timestamp())
+            # Page insights and posts for the date are requested in one batch
+            metrics = self._parse_metrics(date_str, *self._graph_batch(self._metrics_queries(date)))
+        except Exception as e:
+            logger.error(f"Error getting Facebook metrics: {e}")
+            return {}
+        
+        if metrics:
+            if date < datetime.date.today():
+                ttl = self.config.get("historical_metrics_ttl", 86400)
+            else:
+                ttl = self.config.get("metrics_cache_ttl", 300)
+            self._cache_put(self.metrics_cache, date_str, metrics, ttl, self.config.get("metrics_cache_size", 1024))
+        return metrics
+    
+    async def aget_metrics(self, date: datetime.date) -> Dict:
+        """
+        Get metrics for a specific date without blocking the event loop.
+        
+        Args:
+            date: Date to get metrics for
             
-            # Get page impressions
-            response = requests.get(
+        Returns:
+            Dict containing metrics
+        """
+        return await asyncio.to_thread(self.get_metrics, date)
+    
+    def _metrics_queries(self, date: datetime.date) -> List[Tuple[str, Dict]]:
+        """
+        Build the page insights and posts requests for a date's metrics.
+        
+        Args:
+            date: Date to get metrics for
+            
+        Returns:
+            (URL, query parameters) of the insights and the posts requests
+        """
+        since, until = _day_bounds(date)
+        
+        return [
+            (
                 f"{self.api_base_url}/{self.page_id}/insights",
-                params={
-                    "access_token": self.access_token,
+                {
                     "metric": "page_impressions,page_engaged_users,page_post_engagements,page_fans",
                     "period": "day",
                     "since": since,
                     "until": until
                 }
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to get Facebook metrics: {response.text}")
-                return {}
-            
-            insights = response.json().get("data", [])
-            
-            # Process insights data
-            metrics = {
-                "date": date_str,
-                "platform": "facebook",
-                "posts": 0,
-                "engagement": 0,
-                "impressions": 0,
-                "followers": 0,
-                "hourly_engagement": {}
-            }
-            
-            for insight in insights:
-                metric_name = insight.get("name")
-                values = insight.get("values", [])
-                
-                if not values:
-                    continue
-                
-                value = values[0].get("value", 0)
-                
-                if metric_name == "page_impressions":
-                    metrics["impressions"] = value
-                elif metric_name == "page_engaged_users":
-                    metrics["engagement"] = value
-                elif metric_name == "page_fans":
-                    metrics["followers"] = value
-            
-            # Get posts for the date
-            posts_response = requests.get(
+            ),
+            (
                 f"{self.api_base_url}/{self.page_id}/posts",
-                params={
-                    "access_token": self.access_token,
+                {
                     "fields": "id,created_time",
                     "since": since,
                     "until": until
                 }
             )
+        ]
+    
+    def _parse_metrics(self, date_str: str, response: Any, posts_response: Any) -> Dict:
+        """
+        Build a date's metrics from the page insights and posts responses.
+        
+        Args:
+            date_str: Date the metrics are for, as YYYY-MM-DD
+            response: Page insights response
+            posts_response: Page posts response
             
-            if posts_response.status_code == 200:
-                posts = posts_response.json().get("data", [])
-                metrics["posts"] = len(posts)
-                
-                # Get post IDs for the date
-                post_ids = [post.get("id") for post in posts]
-                metrics["post_ids"] = post_ids
+        Returns:
+            Dict containing metrics
+        """
+        if response.status_code != 200:
+            logger.error(f"Failed to get Facebook metrics: {response.text}")
+            return {}
+        
+        insights = _loads(response).get("data", [])
+        
+        # Process insights data
+        metrics = {
+            "date": date_str,
+            "platform": "facebook",
+            "posts": 0,
+            "engagement": 0,
+            "impressions": 0,
+            "followers": 0,
+            "hourly_engagement": {}
+        }
+        
+        for insight in insights:
+            metric_name = insight.get("name")
+            values = insight.get("values", [])
             
-            # Cache metrics
-            self.metrics_cache[date_str] = metrics
+            if not values:
+                continue
             
-            return metrics
-        except Exception as e:
-            logger.error(f"Error getting Facebook metrics: {e}")
-            return {}
+            value = values[0].get("value", 0)
+            
+            if metric_name == "page_impressions":
+                metrics["impressions"] = value
+            elif metric_name == "page_engaged_users":
+                metrics["engagement"] = value
+            elif metric_name == "page_fans":
+                metrics["followers"] = value
+        
+        if posts_response.status_code == 200:
+            posts = _loads(posts_response).get("data", [])
+            metrics["posts"] = len(posts)
+            
+            # Get post IDs for the date
+            post_ids = [post.get("id") for post in posts]
+            metrics["post_ids"] = post_ids
+        
+        return metrics
     
     def get_post_metrics(self, post_id: str) -> Dict:
         """
@@ -363,91 +809,164 @@ class FacebookAgent(BasePlatformAgent):
         Returns:
             Dict containing post metrics
         """
+        # Post insights and post fields are requested in one batch
+        return self.get_many_post_metrics([post_id])[0]
+    
+    async def aget_post_metrics(self, post_id: str) -> Dict:
+        """
+        Get metrics for a specific post without blocking the event loop.
+        
+        Args:
+            post_id: ID of the post
+            
+        Returns:
+            Dict containing post metrics
+        """
+        return await asyncio.to_thread(self.get_post_metrics, post_id)
+    
+    def get_many_post_metrics(self, post_ids: List[str]) -> List[Dict]:
+        """
+        Get metrics for several posts through the Graph API batch endpoint.
+        
+        Each post takes two batched requests, so one HTTP request covers
+        GRAPH_BATCH_LIMIT // 2 posts. Metrics are cached for
+        post_metrics_cache_ttl seconds (config, default 60); only posts
+        without fresh cached metrics are requested.
+        
+        Args:
+            post_ids: IDs of the posts
+            
+        Returns:
+            List of post metrics dicts (empty for posts that failed), in the order of post_ids
+        """
+        results = [self._cache_get(self.post_metrics_cache, post_id) for post_id in post_ids]
+        missing = [i for i, metrics in enumerate(results) if metrics is None]
+        if not missing:
+            return results
+        
         if not self.authenticate():
-            return {}
+            return [{} if metrics is None else metrics for metrics in results]
         
         try:
-            # Get post insights
-            response = requests.get(
-                f"{self.api_base_url}/{post_id}/insights",
-                params={
-                    "access_token": self.access_token,
-                    "metric": "post_impressions,post_engagements,post_reactions_by_type_total"
-                }
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to get Facebook post metrics: {response.text}")
-                return {}
-            
-            insights = response.json().get("data", [])
-            
-            # Process insights data
-            metrics = {
-                "post_id": post_id,
-                "platform": "facebook",
-                "engagement": 0,
-                "impressions": 0,
-                "reactions": {
-                    "like": 0,
-                    "love": 0,
-                    "wow": 0,
-                    "haha": 0,
-                    "sad": 0,
-                    "angry": 0
-                },
-                "shares": 0,
-                "comments": 0
-            }
+            queries = [query for i in missing for query in self._post_metrics_queries(post_ids[i])]
+            responses = self._graph_batch(queries)
+        except Exception as e:
+            logger.error(f"Error getting Facebook post metrics: {e}")
+            return [{} if metrics is None else metrics for metrics in results]
+        
+        ttl = self.config.get("post_metrics_cache_ttl", 60)
+        max_size = self.config.get("post_metrics_cache_size", 8192)
+        for n, i in enumerate(missing):
+            try:
+                metrics = self._parse_post_metrics(post_ids[i], responses[2 * n], responses[2 * n + 1])
+            except Exception as e:
+                logger.error(f"Error getting Facebook post metrics: {e}")
+                metrics = {}
+            if metrics:
+                self._cache_put(self.post_metrics_cache, post_ids[i], metrics, ttl, max_size)
+            results[i] = metrics
+        return results
+    
+    async def aget_many_post_metrics(self, post_ids: List[str]) -> List[Dict]:
+        """
+        Get metrics for several posts without blocking the event loop.
+        
+        The posts are split into batch requests that are sent concurrently,
+        at most metrics_concurrency (config, default 10) at once, to stay
+        within the Graph API rate limits.
+        
+        Args:
+            post_ids: IDs of the posts
             
-            for insight in insights:
-                metric_name = insight.get("name")
-                values = insight.get("values", [])
-                
-                if not values:
-                    continue
-                
-                value = values[0].get("value", 0)
-                
-                if metric_name == "post_impressions":
-                    metrics["impressions"] = value
-                elif metric_name == "post_engagements":
-                    metrics["engagement"] = value
-                elif metric_name == "post_reactions_by_type_total":
-                    if isinstance(value, dict):
-                        metrics["reactions"] = {
-                            "like": value.get("like", 0),
-                            "love": value.get("love", 0),
-                            "wow": value.get("wow", 0),
-                            "haha": value.get("haha", 0),
-                            "sad": value.get("sad", 0),
-                            "angry": value.get("angry", 0)
-                        }
-            
-            # Get comments and shares
-            response = requests.get(
-                f"{self.api_base_url}/{post_id}",
-                params={
-                    "access_token": self.access_token,
-                    "fields": "shares,comments.summary(true)"
-                }
-            )
+        Returns:
+            List of post metrics dicts (empty for posts that failed), in the order of post_ids
+        """
+        slots = asyncio.Semaphore(self.config.get("metrics_concurrency", 10))
+        per_batch = GRAPH_BATCH_LIMIT // 2
+        
+        async def fetch(chunk: List[str]) -> List[Dict]:
+            async with slots:
+                return await asyncio.to_thread(self.get_many_post_metrics, chunk)
+        
+        chunks = await asyncio.gather(*(
+            fetch(post_ids[start:start + per_batch]) for start in range(0, len(post_ids), per_batch)
+        ))
+        return [metrics for chunk in chunks for metrics in chunk]
+    
+    def _post_metrics_queries(self, post_id: str) -> List[Tuple[str, Dict]]:
+        """
+        Build the insights and fields requests for a post's metrics.
+        
+        Args:
+            post_id: ID of the post
             
-            if response.status_code == 200:
-                post_data = response.json()
-                
-                # Get shares count
-                shares = post_data.get("shares", {})
-                metrics["shares"] = shares.get("count", 0)
-                
-                # Get comments count
-                comments = post_data.get("comments", {}).get("summary", {})
-                metrics["comments"] = comments.get("total_count", 0)
+        Returns:
+            (URL, query parameters) of the insights and the post fields requests
+        """
+        return [
+            (f"{self.api_base_url}/{post_id}/insights", _POST_INSIGHTS_PARAMS),
+            (f"{self.api_base_url}/{post_id}", _POST_FIELDS_PARAMS)
+        ]
+    
+    def _parse_post_metrics(self, post_id: str, response: Any, post_response: Any) -> Dict:
+        """
+        Build a post's metrics from the post insights and post fields responses.
+        
+        Args:
+            post_id: ID of the post
+            response: Post insights response
+            post_response: Post fields (shares, comments) response
             
-            return metrics
-        except Exception as e:
-            logger.error(f"Error getting Facebook post metrics: {e}")
+        Returns:
+            Dict containing post metrics
+        """
+        if response.status_code != 200:
+            logger.error(f"Failed to get Facebook post metrics: {response.text}")
             return {}
+        
+        insights = _loads(response).get("data", [])
+        
+        # Process insights data
+        metrics = {
+            "post_id": post_id,
+            "platform": "facebook",
+            "engagement": 0,
+            "impressions": 0,
+            "reactions": dict.fromkeys(_REACTION_KEYS, 0),
+            "shares": 0,
+            "comments": 0
+        }
+        
+        for insight in insights:
+            metric_name = insight.get("name")
+            values = insight.get("values", [])
+            
+            if not values:
+                continue
+            
+            value = values[0].get("value", 0)
+            
+            if metric_name == "post_impressions":
+                metrics["impressions"] = value
+            elif metric_name == "post_engagements":
+                metrics["engagement"] = value
+            elif metric_name == "post_reactions_by_type_total":
+                if isinstance(value, dict):
+                    metrics["reactions"] = {key: value.get(key, 0) for key in _REACTION_KEYS}
+        
+        # Get comments and shares
+        if post_response.status_code == 200:
+            post_data = _loads(post_response)
+            
+            # Get shares count
+            shares = post_data.get("shares", {})
+            metrics["shares"] = shares.get("count", 0)
+            
+            # Get comments count
+            comments = post_data.get("comments", {}).get("summary", {})
+            metrics["comments"] = comments.get("total_count", 0)
+        
+        return metrics
     
     def format_content(self, content: Dict) -> Dict:
         """
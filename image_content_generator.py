@@ -110,7 +110,8 @@ class ImageContentGenerator:
             return {"success": False, "error": "No image generator configured"}
         
         # Get platform-specific settings
-        platform_config = self.platform_settings.get(platform.lower(), {})
+        platform_key = platform.lower()
+        platform_config = self.platform_settings.get(platform_key, {})
         
         # Use platform-specific defaults if not specified
         style = style or platform_config.get("style", self.default_style)
@@ -120,13 +121,13 @@ class ImageContentGenerator:
             if not prompt and self.text_llm:
                 # Generate a detailed prompt using the text LLM
                 style_description = self.image_styles.get(style, style)
-                prompt_request = f"""
-                Create a detailed image generation prompt for a {platform} post about {topic}.
-                The image should be {style_description}.
-                Focus on visual elements, composition, colors, and mood.
-                The prompt should be detailed enough for an AI image generator to create a compelling image.
-                Return only the prompt text without any explanations or additional text.
-                """
+                prompt_request = (
+                    f"Create a detailed image generation prompt for a {platform} post about {topic}. "
+                    f"The image should be {style_description}. "
+                    "Focus on visual elements, composition, colors, and mood. "
+                    "The prompt should be detailed enough for an AI image generator to create a compelling image. "
+                    "Return only the prompt text without any explanations or additional text."
+                )
                 
                 prompt = self.text_llm.generate_text(prompt_request, max_tokens=200, temperature=0.7)
                 
@@ -138,7 +139,7 @@ class ImageContentGenerator:
                 prompt = f"A {style_description} image about {topic} for {platform}"
             
             # Generate the image
-            if platform.lower() in self.platform_settings:
+            if platform_key in self.platform_settings:
                 # Use platform-specific generation
                 image_result = self.image_generator.generate_social_media_image(
                     platform=platform,
@@ -219,11 +220,11 @@ class ImageContentGenerator:
             # Generate a base prompt if we have a text LLM
             base_prompt = None
             if self.text_llm:
-                prompt_request = f"""
-                Create a detailed image generation prompt for a series of {count} related images about {topic} for {platform}.
-                The images should tell a visual story or show different aspects of the topic.
-                Return only the base prompt that can be modified for each image in the series.
-                """
+                prompt_request = (
+                    f"Create a detailed image generation prompt for a series of {count} related images about {topic} for {platform}. "
+                    "The images should tell a visual story or show different aspects of the topic. "
+                    "Return only the base prompt that can be modified for each image in the series."
+                )
                 
                 base_prompt = self.text_llm.generate_text(prompt_request, max_tokens=200, temperature=0.7)
                 base_prompt = base_prompt.strip().strip('"\'')
@@ -233,13 +234,12 @@ class ImageContentGenerator:
             for i in range(count):
                 # Create a variation of the prompt for each image
                 if base_prompt and self.text_llm:
-                    variation_request = f"""
-                    Create a variation of this base prompt for image {i+1} in a series of {count} related images:
-                    Base prompt: "{base_prompt}"
-                    
-                    This should be part {i+1} of the visual story or a different aspect of {topic}.
-                    Return only the modified prompt without any explanations.
-                    """
+                    variation_request = (
+                        f"Create a variation of this base prompt for image {i+1} in a series of {count} related images:\n"
+                        f"Base prompt: \"{base_prompt}\"\n"
+                        f"This should be part {i+1} of the visual story or a different aspect of {topic}. "
+                        "Return only the modified prompt without any explanations."
+                    )
                     
                     prompt = self.text_llm.generate_text(variation_request, max_tokens=200, temperature=0.7)
                     prompt = prompt.strip().strip('"\'')
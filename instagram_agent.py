@@ -27,6 +27,8 @@ class InstagramAgent(BasePlatformAgent):
     - Optimizing content for Instagram's algorithm
     """
     
+    __slots__ = ('api_base_url', 'access_token', 'instagram_account_id')
+    
     def __init__(self, config: Dict = None):
         """
         Initialize the Instagram agent.
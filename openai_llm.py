@@ -8,13 +8,16 @@ using the OpenAI API (GPT models).
 import logging
 import json
 import os
-import requests
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 
-from .base_text_llm import BaseTextLLM
+from .base_text_llm import BaseTextLLM, StreamError
 
 logger = logging.getLogger("llm_integration.openai_llm")
 
+# (connect, read) timeouts for streaming requests; the read timeout bounds
+# the wait for each chunk rather than the whole response
+_STREAM_TIMEOUT = (10, 60)
+
 class OpenAILLM(BaseTextLLM):
     """
     OpenAI LLM Provider for text generation.
@@ -22,6 +25,10 @@ class OpenAILLM(BaseTextLLM):
     This class implements the BaseTextLLM interface for OpenAI's GPT models.
     """
     
+    __slots__ = ('model', 'api_base')
+    
+    supports_streaming = True
+    
     def __init__(self, config: Dict = None):
         """
         Initialize the OpenAI LLM provider.
@@ -65,7 +72,7 @@ class OpenAILLM(BaseTextLLM):
                 "temperature": temperature
             }
             
-            response = requests.post(
+            response = self.http().post(
                 f"{self.api_base}/chat/completions",
                 headers=headers,
                 json=data
@@ -82,6 +89,67 @@ class OpenAILLM(BaseTextLLM):
             logger.error(f"Error generating text with OpenAI: {e}")
             return f"Error: {str(e)}"
     
+    def generate_text_stream(self, prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> Iterator[str]:
+        """
+        Generate text using OpenAI's GPT models, yielding chunks as they arrive.
+        
+        Closing the iterator early closes the connection, which stops generation.
+        
+        Args:
+            prompt: Input prompt for text generation
+            max_tokens: Maximum number of tokens to generate
+            temperature: Controls randomness (0.0 to 1.0)
+            
+        Returns:
+            Iterator of generated text chunks
+            
+        Raises:
+            StreamError: If the API key is invalid or the request fails
+        """
+        if not self.validate_api_key():
+            raise StreamError("Invalid API key")
+        
+        try:
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            data = {
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "stream": True
+            }
+            
+            with self.http().post(
+                f"{self.api_base}/chat/completions",
+                headers=headers,
+                json=data,
+                stream=True,
+                timeout=_STREAM_TIMEOUT
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"OpenAI API error: {response.text}")
+                    raise StreamError(f"{response.status_code} - {response.text}")
+                
+                # Server-sent events: "data: {json}" lines, ending with "data: [DONE]"
+                for line in response.iter_lines():
+                    if not line.startswith(b"data: "):
+                        continue
+                    payload = line[6:]
+                    if payload == b"[DONE]":
+                        break
+                    delta = json.loads(payload)["choices"][0]["delta"].get("content")
+                    if delta:
+                        yield delta
+        except StreamError:
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming text with OpenAI: {e}")
+            raise StreamError(str(e)) from e
+    
     def generate_social_media_post(self, platform: str, topic: str, tone: str = "professional", 
                                   hashtags: int = 3, emojis: bool = True) -> Dict:
         """
@@ -232,9 +300,9 @@ class OpenAILLM(BaseTextLLM):
         
         return optimized
     
-    def validate_api_key(self) -> bool:
+    def _check_api_key(self) -> bool:
         """
-        Validate the OpenAI API key.
+        Check the OpenAI API key against the API.
         
         Returns:
             bool: Whether the API key is valid
@@ -249,7 +317,7 @@ class OpenAILLM(BaseTextLLM):
                 "Content-Type": "application/json"
             }
             
-            response = requests.get(
+            response = self.http().get(
                 f"{self.api_base}/models",
                 headers=headers
             )
@@ -17,6 +17,25 @@ from src.content_generation.content_generator import ContentGenerator
 from src.content_generation.text_content_generator import TextContentGenerator
 from src.content_generation.image_content_generator import ImageContentGenerator
 from src.content_generation.content_optimizer import ContentOptimizer
+from src.llm_integration.base_text_llm import BaseTextLLM, StreamError
+
+
+class StreamingTextLLM(BaseTextLLM):
+    """Streaming text LLM that yields fixed chunks, then optionally fails."""
+
+    supports_streaming = True
+
+    def __init__(self, chunks, error=None):
+        super().__init__({})
+        self.chunks = chunks
+        self.error = error
+        self.calls = 0
+
+    def generate_text_stream(self, prompt, max_tokens=500, temperature=0.7):
+        self.calls += 1
+        yield from self.chunks
+        if self.error:
+            raise StreamError(self.error)
 
 
 class TestContentGenerator(unittest.TestCase):
@@ -321,6 +340,77 @@ class TestContentOptimizer(unittest.TestCase):
         self.assertIn('recommendations', result)
         self.mock_text_llm.generate_text.assert_called_once()
 
+    def test_history_keeps_optimized_text(self):
+        """Test that history entries keep the optimized text, including skipped optimizations."""
+        self.mock_text_llm.generate_text.return_value = "Optimized text for Twitter"
+        text = "A post already written for Facebook, well within its limits"
+        
+        self.content_optimizer.optimize_text_for_platform(
+            text="Original long text that needs to be optimized",
+            source_platform="facebook",
+            target_platform="twitter"
+        )
+        self.content_optimizer.optimize_text_for_platform(
+            text=text,
+            source_platform="facebook",
+            target_platform="facebook"
+        )
+        
+        optimized, skipped = list(self.content_optimizer.optimization_history)[-2:]
+        self.assertEqual(optimized['optimized_text'], "Optimized text for Twitter")
+        self.assertEqual(skipped['optimized_text'], text)
+        self.mock_text_llm.generate_text.assert_called_once()
+
+    def test_platform_settings_edit_after_init(self):
+        """Test that platform settings changed after initialization are applied."""
+        self.mock_text_llm.generate_text.return_value = "Short words only here #tag and more words"
+        self.content_optimizer.update_platform_settings(
+            "twitter", {"text_length": {"min": 10, "optimal": 20, "max": 28}}
+        )
+        
+        result = self.content_optimizer.optimize_text_for_platform(
+            text="Original long text that needs to be optimized",
+            source_platform="facebook",
+            target_platform="twitter"
+        )
+        
+        # Cut at the last word boundary within the new limit
+        self.assertEqual(result['optimized_text'], "Short words only here #tag")
+        
+        self.content_optimizer.platform_settings["twitter"]["tone"] = "playful"
+        self.content_optimizer.update_platform_settings()
+        self.assertEqual(self.content_optimizer._get_cfg("twitter").tone, "playful")
+
+    def test_bounded_generation_truncates_stream(self):
+        """Test that streamed output over the limit is cut at a word boundary."""
+        text_llm = StreamingTextLLM(["word " * 50] * 10)
+        content_optimizer = ContentOptimizer(text_llm=text_llm)
+        
+        result = content_optimizer.optimize_text_for_platform(
+            text="Original long text that needs to be optimized",
+            source_platform="facebook",
+            target_platform="tiktok"
+        )
+        
+        self.assertTrue(result['success'])
+        self.assertLessEqual(len(result['optimized_text']), 150)
+        self.assertTrue(result['optimized_text'].endswith("word"))
+
+    def test_bounded_generation_stream_error(self):
+        """Test that a failed stream is reported as an error, without partial output, and not cached."""
+        text_llm = StreamingTextLLM(["Partial output "], error="connection reset")
+        content_optimizer = ContentOptimizer(text_llm=text_llm)
+        
+        for _ in range(2):
+            result = content_optimizer.optimize_text_for_platform(
+                text="Original long text that needs to be optimized",
+                source_platform="facebook",
+                target_platform="twitter"
+            )
+            self.assertEqual(result['optimized_text'], "Error: connection reset")
+        
+        self.assertEqual(text_llm.calls, 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,16 +8,21 @@ import unittest
 import os
 import sys
 import datetime
+import json
+import shutil
+import tempfile
 from unittest.mock import MagicMock, patch
 
 # Add the src directory to the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.platform_agents.base_agent import BasePlatformAgent
-from src.platform_agents.facebook_agent import FacebookAgent
+from src.platform_agents.facebook_agent import FacebookAgent, GRAPH_BATCH_LIMIT
 from src.platform_agents.twitter_agent import TwitterAgent
 from src.platform_agents.instagram_agent import InstagramAgent
 from src.platform_agents.tiktok_agent import TikTokAgent
+from src.llm_integration.base_provider import TokenBucket
+from src.llm_integration.api_key_manager import APIKeyManager, PLAIN_CACHE_TTL
 
 
 class TestBasePlatformAgent(unittest.TestCase):
@@ -154,6 +159,257 @@ class TestFacebookAgent(unittest.TestCase):
         self.mock_api_client.get_facebook_post_metrics.assert_called_once_with('12345')
 
 
+class TestFacebookRateLimit(unittest.TestCase):
+    """Test cases for the FacebookAgent client-side rate limit."""
+
+    def test_no_limiter_by_default(self):
+        """Test that Graph API calls are not throttled unless configured."""
+        facebook_agent = FacebookAgent({"access_token": "token", "page_id": "12345"})
+        
+        self.assertIsNone(facebook_agent._limiter)
+
+    def test_configured_limiter(self):
+        """Test that graph_calls_per_hour and graph_burst configure the limiter."""
+        facebook_agent = FacebookAgent({
+            "access_token": "token",
+            "page_id": "12345",
+            "graph_calls_per_hour": 7200,
+            "graph_burst": 5
+        })
+        
+        self.assertEqual(facebook_agent._limiter.rate, 2.0)
+        self.assertEqual(facebook_agent._limiter.capacity, 5)
+
+    def test_request_without_limiter_does_not_sleep(self):
+        """Test that an unthrottled request is sent without waiting."""
+        facebook_agent = FacebookAgent({"access_token": "token", "page_id": "12345"})
+        facebook_agent.session = MagicMock()
+        facebook_agent.session.request.return_value = MagicMock(status_code=200, content=b'{"id": "1"}')
+        
+        with patch('time.sleep') as mock_sleep:
+            facebook_agent._request("GET", "https://graph.facebook.com/v18.0/me")
+        
+        mock_sleep.assert_not_called()
+        facebook_agent.session.request.assert_called_once()
+
+    def test_token_bucket_rejects_non_positive_rate(self):
+        """Test that a token bucket needs a positive rate."""
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+        with self.assertRaises(ValueError):
+            TokenBucket(-1.0)
+
+
+class TestFacebookGraphBatch(unittest.TestCase):
+    """Test cases for the FacebookAgent Graph API batch requests."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.facebook_agent = FacebookAgent({"access_token": "token", "page_id": "12345"})
+        self.facebook_agent.session = MagicMock()
+        self.facebook_agent.session.request.side_effect = self._graph_api
+        
+        # Post IDs whose insights request fails, or does not finish in time
+        self.failing = set()
+        self.timed_out = set()
+
+    def _response(self, status_code, body):
+        """Build an HTTP response with a JSON body."""
+        text = json.dumps(body)
+        response = MagicMock(status_code=status_code, content=text.encode(), text=text)
+        response.json.return_value = body
+        return response
+
+    def _graph_api(self, method, url, **kwargs):
+        """Answer page info requests and batch requests for post metrics."""
+        if method == "GET":
+            return self._response(200, {"id": "12345", "name": "Test Page"})
+        
+        results = []
+        for op in json.loads(kwargs["data"]["batch"]):
+            path = op["relative_url"].split("?")[0]
+            post_id = path.split("/")[0]
+            value = int(post_id)
+            if path.endswith("/insights"):
+                if post_id in self.timed_out:
+                    results.append(None)
+                    continue
+                if post_id in self.failing:
+                    results.append({"code": 400, "body": json.dumps({"error": {"message": "Unsupported", "code": 100}})})
+                    continue
+                body = {"data": [
+                    {"name": "post_engagements", "values": [{"value": value}]},
+                    {"name": "post_impressions", "values": [{"value": 10 * value}]}
+                ]}
+            else:
+                body = {"shares": {"count": 2 * value}, "comments": {"summary": {"total_count": 3 * value}}}
+            results.append({"code": 200, "body": json.dumps(body)})
+        return self._response(200, results)
+
+    def _batches(self):
+        """Return the requests sent in each batch call."""
+        return [
+            json.loads(call.kwargs["data"]["batch"])
+            for call in self.facebook_agent.session.request.call_args_list
+            if call.args[0] == "POST"
+        ]
+
+    def test_graph_batch_splits_queries(self):
+        """Test that queries are sent GRAPH_BATCH_LIMIT at a time and answered in order."""
+        queries = [
+            (f"{self.facebook_agent.api_base_url}/{n}", {"fields": "shares"})
+            for n in range(1, 2 * GRAPH_BATCH_LIMIT + 2)
+        ]
+        
+        responses = self.facebook_agent._graph_batch(queries)
+        
+        batches = self._batches()
+        self.assertEqual([len(ops) for ops in batches], [GRAPH_BATCH_LIMIT, GRAPH_BATCH_LIMIT, 1])
+        self.assertEqual(batches[0][0], {"method": "GET", "relative_url": "1?fields=shares"})
+        self.assertEqual(batches[2][0]["relative_url"], f"{2 * GRAPH_BATCH_LIMIT + 1}?fields=shares")
+        self.assertEqual(len(responses), len(queries))
+        self.assertEqual(
+            [json.loads(response.text)["shares"]["count"] for response in responses],
+            [2 * n for n in range(1, 2 * GRAPH_BATCH_LIMIT + 2)]
+        )
+
+    def test_graph_batch_exact_limit(self):
+        """Test that a full batch of queries takes a single request."""
+        queries = [(f"{self.facebook_agent.api_base_url}/{n}", {}) for n in range(1, GRAPH_BATCH_LIMIT + 1)]
+        
+        responses = self.facebook_agent._graph_batch(queries)
+        
+        self.assertEqual([len(ops) for ops in self._batches()], [GRAPH_BATCH_LIMIT])
+        self.assertEqual(len(responses), GRAPH_BATCH_LIMIT)
+        self.assertEqual(self.facebook_agent._graph_batch([]), [])
+
+    def test_graph_batch_failed_batch(self):
+        """Test that a failed batch request fails each of its queries."""
+        failed = self._response(500, {"error": {"message": "Internal error", "code": 1}})
+        self.facebook_agent.session.request.side_effect = None
+        self.facebook_agent.session.request.return_value = failed
+        queries = [(f"{self.facebook_agent.api_base_url}/{n}", {}) for n in range(1, 4)]
+        
+        responses = self.facebook_agent._graph_batch(queries)
+        
+        self.assertEqual(responses, [failed] * 3)
+
+    def test_get_many_post_metrics(self):
+        """Test that each post gets the metrics of its own pair of batched requests."""
+        post_ids = [str(n) for n in range(1, GRAPH_BATCH_LIMIT // 2 + 2)]
+        
+        results = self.facebook_agent.get_many_post_metrics(post_ids)
+        
+        self.assertEqual([len(ops) for ops in self._batches()], [GRAPH_BATCH_LIMIT, 2])
+        for post_id, metrics in zip(post_ids, results):
+            value = int(post_id)
+            self.assertEqual(metrics["post_id"], post_id)
+            self.assertEqual(metrics["engagement"], value)
+            self.assertEqual(metrics["impressions"], 10 * value)
+            self.assertEqual(metrics["shares"], 2 * value)
+            self.assertEqual(metrics["comments"], 3 * value)
+
+    def test_get_many_post_metrics_item_errors(self):
+        """Test that a failed or timed out request only fails its own post, which is not cached."""
+        self.failing.add("2")
+        self.timed_out.add("4")
+        
+        results = self.facebook_agent.get_many_post_metrics(["1", "2", "3", "4", "5"])
+        
+        self.assertEqual(results[1], {})
+        self.assertEqual(results[3], {})
+        self.assertEqual([metrics["engagement"] for metrics in (results[0], results[2], results[4])], [1, 3, 5])
+        
+        # Only the failed posts are requested again
+        self.failing.clear()
+        self.timed_out.clear()
+        self.facebook_agent.session.request.reset_mock()
+        
+        results = self.facebook_agent.get_many_post_metrics(["1", "2", "3", "4", "5"])
+        
+        batches = self._batches()
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([op["relative_url"].split("?")[0] for op in batches[0]], ["2/insights", "2", "4/insights", "4"])
+        self.assertEqual([metrics["engagement"] for metrics in results], [1, 2, 3, 4, 5])
+
+
+class TestAPIKeyManagerCache(unittest.TestCase):
+    """Test cases for the APIKeyManager decrypted key cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = APIKeyManager(
+            config_path=os.path.join(self.temp_dir, "api_keys.json"),
+            master_password="password"
+        )
+        self.manager.add_key("facebook", "access_token", "fb-token")
+        self.manager.add_key("facebook", "app_secret", "fb-secret")
+        self.manager.add_key("twitter", "api_key", "tw-key")
+        self.manager.cipher_suite = MagicMock(wraps=self.manager.cipher_suite)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_get_key_decrypts_once(self):
+        """Test that a cached key is returned without decrypting it again."""
+        self.assertEqual(self.manager.get_key("facebook", "access_token"), "fb-token")
+        self.assertEqual(self.manager.get_key("facebook", "access_token"), "fb-token")
+        self.assertEqual(self.manager.get_service_keys("facebook"), {
+            "access_token": "fb-token",
+            "app_secret": "fb-secret"
+        })
+        
+        self.assertEqual(self.manager.cipher_suite.decrypt.call_count, 2)
+
+    def test_cached_key_expires(self):
+        """Test that a cached key is decrypted again once its TTL has passed."""
+        with patch('time.monotonic', return_value=1000.0):
+            self.manager.get_key("facebook", "access_token")
+        with patch('time.monotonic', return_value=1000.0 + PLAIN_CACHE_TTL - 1):
+            self.manager.get_key("facebook", "access_token")
+        
+        self.assertEqual(self.manager.cipher_suite.decrypt.call_count, 1)
+        
+        with patch('time.monotonic', return_value=1000.0 + PLAIN_CACHE_TTL):
+            self.assertEqual(self.manager.get_key("facebook", "access_token"), "fb-token")
+        
+        self.assertEqual(self.manager.cipher_suite.decrypt.call_count, 2)
+
+    def test_least_recently_used_key_is_evicted(self):
+        """Test that the cache holds at most PLAIN_CACHE_SIZE keys, dropping the least recently used."""
+        with patch('src.llm_integration.api_key_manager.PLAIN_CACHE_SIZE', 2):
+            self.manager.get_key("facebook", "access_token")
+            self.manager.get_key("facebook", "app_secret")
+            self.manager.get_key("facebook", "access_token")
+            self.manager.get_key("twitter", "api_key")
+            
+            self.assertEqual(list(self.manager._plain_cache), [
+                ("facebook", "access_token"),
+                ("twitter", "api_key")
+            ])
+            
+            self.manager.get_key("facebook", "app_secret")
+        
+        self.assertEqual(self.manager.cipher_suite.decrypt.call_count, 4)
+        self.assertEqual(len(self.manager._plain_cache), 2)
+
+    def test_changed_keys_are_not_served_from_cache(self):
+        """Test that add_key, remove_key and load_keys drop cached keys."""
+        self.manager.get_key("facebook", "access_token")
+        self.manager.get_key("facebook", "app_secret")
+        
+        self.manager.add_key("facebook", "access_token", "fb-token-2")
+        self.assertEqual(self.manager.get_key("facebook", "access_token"), "fb-token-2")
+        
+        self.manager.remove_key("facebook", "app_secret")
+        self.assertIsNone(self.manager.get_key("facebook", "app_secret"))
+        
+        self.manager.load_keys()
+        self.assertEqual(self.manager._plain_cache, {})
+
+
 class TestTwitterAgent(unittest.TestCase):
     """Test cases for the TwitterAgent class."""
 
@@ -15,7 +15,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.team_leader.team_leader import TeamLeader
 from src.team_leader.scheduler import Scheduler
-from src.team_leader.analytics import Analytics
+from src.team_leader.analytics import Analytics, AnalyticsEngine
 from src.team_leader.report_generator import TeamReportGenerator
 
 
@@ -257,6 +257,165 @@ class TestAnalytics(unittest.TestCase):
         self.assertEqual(result['engagement_per_post'], 75)  # 1050/14
 
 
+class TestAnalyticsEngine(unittest.TestCase):
+    """Test cases for the AnalyticsEngine class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.engine = AnalyticsEngine()
+        self.today = datetime.date.today()
+        
+        # One entry per day from just before a 7-day window up to tomorrow
+        for offset in range(-1, 10):
+            day = self.today - datetime.timedelta(days=offset)
+            self.engine.store_metrics('twitter', day.isoformat(), {
+                'engagement': 10 * (offset + 2),
+                'impressions': 100 * (offset + 2),
+                'followers': 1000 - 10 * offset
+            })
+
+    def _day(self, offset):
+        """Return the ISO date string for offset days before today."""
+        return (self.today - datetime.timedelta(days=offset)).isoformat()
+
+    def _baseline_sum(self, platform, metric, period):
+        """Sum a metric day by day over [today - period, today], as the loop-based version did."""
+        total = 0
+        current = self.today - datetime.timedelta(days=period)
+        while current <= self.today:
+            metrics = self.engine.metrics_store[platform].get(current.isoformat())
+            if metrics:
+                total += metrics.get(metric, 0)
+            current += datetime.timedelta(days=1)
+        return total
+
+    def test_get_metrics_inclusive_range(self):
+        """Test that get_metrics includes both ends of the range, in date order."""
+        result = self.engine.get_metrics('twitter', self._day(7), self._day(0))
+        
+        self.assertEqual(list(result), [self._day(offset) for offset in range(7, -1, -1)])
+        self.assertEqual(list(self.engine.get_metrics('twitter', self._day(3))), [self._day(3)])
+        self.assertEqual(self.engine.get_metrics('facebook', self._day(3)), {})
+
+    def test_calculate_engagement_rate_window(self):
+        """Test that the engagement rate covers exactly [today - period, today]."""
+        for period in (0, 1, 7, 8, 30):
+            expected = (self._baseline_sum('twitter', 'engagement', period) /
+                        self._baseline_sum('twitter', 'impressions', period))
+            self.assertAlmostEqual(self.engine.calculate_engagement_rate('twitter', period), expected)
+        
+        self.assertEqual(self.engine.calculate_engagement_rate('facebook'), 0.0)
+
+    def test_calculate_growth_rate_window(self):
+        """Test that the growth rate compares the first and last days of the period."""
+        # followers on day offset are 1000 - 10 * offset
+        self.assertAlmostEqual(self.engine.calculate_growth_rate('twitter', 7), (1000 - 930) / 930 * 100)
+        
+        # A missing first day falls back to the first stored day in the period
+        del self.engine.metrics_store['twitter'][self._day(9)]
+        self.engine._sorted_dates['twitter'].remove(self._day(9))
+        self.assertAlmostEqual(self.engine.calculate_growth_rate('twitter', 9), (1000 - 920) / 920 * 100)
+        
+        self.assertEqual(self.engine.calculate_growth_rate('facebook'), 0.0)
+
+    def test_identify_trends(self):
+        """Test trend direction, slope and confidence against a least-squares fit."""
+        import numpy as np
+        
+        # followers fall by 10 each day into the past, so rise by 10 per day
+        result = self.engine.identify_trends('twitter', 'followers', 7)
+        
+        self.assertEqual(result['trend'], 'increasing')
+        self.assertAlmostEqual(result['slope'], 10.0)
+        self.assertAlmostEqual(result['confidence'], 1.0)
+        
+        result = self.engine.identify_trends('twitter', 'engagement', 7)
+        
+        self.assertEqual(result['trend'], 'decreasing')
+        self.assertAlmostEqual(result['slope'], -10.0)
+        
+        values = [5, 9, 4, 8, 6]
+        for offset, value in enumerate(values):
+            self.engine.store_metrics('facebook', self._day(offset), {'reach': value})
+        x = np.array([30 - offset for offset in range(len(values))], dtype=float)
+        slope, intercept = np.polyfit(x, values, 1)
+        residual = np.sum((np.array(values) - (slope * x + intercept)) ** 2)
+        total = np.sum((np.array(values) - np.mean(values)) ** 2)
+        
+        result = self.engine.identify_trends('facebook', 'reach', 30)
+        
+        self.assertAlmostEqual(result['slope'], slope)
+        self.assertAlmostEqual(result['confidence'], 1 - residual / total)
+
+    def test_identify_trends_stable_and_unknown(self):
+        """Test stable and unknown trends."""
+        for offset in range(3):
+            self.engine.store_metrics('facebook', self._day(offset), {'followers': 500})
+        
+        result = self.engine.identify_trends('facebook', 'followers', 7)
+        
+        self.assertEqual(result['trend'], 'stable')
+        self.assertEqual(result['slope'], 0.0)
+        
+        # Only two days fall inside a one-day period
+        result = self.engine.identify_trends('facebook', 'followers', 1)
+        
+        self.assertEqual(result, {'trend': 'unknown', 'slope': 0.0, 'confidence': 0.0})
+        self.assertEqual(self.engine.identify_trends('twitter', 'missing', 7)['trend'], 'unknown')
+
+    def test_get_best_performing_content(self):
+        """Test that the top ten content items in the period are returned in order."""
+        engine = AnalyticsEngine()
+        scores = [3, 14, 7, 7, 1, 12, 9, 2, 11, 7, 5, 13]
+        for offset, score in enumerate(scores):
+            engine.store_metrics('instagram', self._day(offset), {
+                'content': [
+                    {'id': f'post-{offset}', 'metrics': {'engagement': score}},
+                    {'id': f'draft-{offset}', 'metrics': {}}
+                ]
+            })
+        engine.store_metrics('instagram', self._day(-1), {
+            'content': [{'id': 'tomorrow', 'metrics': {'engagement': 100}}]
+        })
+        
+        result = engine.get_best_performing_content('instagram', period=7)
+        
+        in_period = sorted(
+            ({'id': f'post-{offset}', 'score': scores[offset]} for offset in range(7, -1, -1)),
+            key=lambda item: item['score'],
+            reverse=True
+        )
+        self.assertEqual([item['id'] for item in result], [item['id'] for item in in_period])
+        
+        result = engine.get_best_performing_content('instagram', period=11)
+        
+        self.assertEqual(len(result), 10)
+        self.assertEqual(
+            [item['metrics']['engagement'] for item in result],
+            [14, 13, 12, 11, 9, 7, 7, 7, 5, 3]
+        )
+        # Ties keep date order
+        self.assertEqual([item['id'] for item in result[5:8]], ['post-9', 'post-3', 'post-2'])
+        self.assertEqual(engine.get_best_performing_content('facebook'), [])
+
+    def test_store_metrics_invalidates_caches(self):
+        """Test that results computed before a store reflect the new metrics afterwards."""
+        self.engine.calculate_engagement_rate('twitter', 7)
+        self.engine.identify_trends('twitter', 'followers', 7)
+        
+        self.engine.store_metrics('twitter', self._day(0), {
+            'engagement': 1000,
+            'impressions': 2000,
+            'followers': 2000
+        })
+        
+        expected = (self._baseline_sum('twitter', 'engagement', 7) /
+                    self._baseline_sum('twitter', 'impressions', 7))
+        self.assertAlmostEqual(self.engine.calculate_engagement_rate('twitter', 7), expected)
+        self.assertEqual(self.engine.get_metrics('twitter', self._day(0))[self._day(0)]['followers'], 2000)
+        self.assertGreater(self.engine.identify_trends('twitter', 'followers', 7)['slope'], 10.0)
+
+
 class TestTeamReportGenerator(unittest.TestCase):
     """Test cases for the TeamReportGenerator class."""
 
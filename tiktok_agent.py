@@ -27,6 +27,8 @@ class TikTokAgent(BasePlatformAgent):
     - Optimizing content for TikTok's algorithm
     """
     
+    __slots__ = ('api_base_url', 'access_token', 'client_key', 'client_secret', 'open_id')
+    
     def __init__(self, config: Dict = None):
         """
         Initialize the TikTok agent.
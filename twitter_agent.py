@@ -29,6 +29,9 @@ class TwitterAgent(BasePlatformAgent):
     - Optimizing content for Twitter's algorithm
     """
     
+    __slots__ = ('api_base_url', 'api_v1_url', 'bearer_token', 'api_key', 'api_secret',
+                 'access_token', 'access_secret', 'user_id')
+    
     def __init__(self, config: Dict = None):
         """
         Initialize the Twitter agent.